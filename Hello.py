@@ -22,9 +22,10 @@ def run():
         
         ### Available Demos:
         - **Prisoner's Dilemma** - Classic two-player game demonstrating strategic interaction
-        - **Nash Equilibrium** - Find equilibrium points in 2x2 games
+        - **Nash Equilibrium** - Find equilibrium points in 2x2 and many-player games
         - **Mixed Strategy** - Calculate optimal mixed strategies
         - **Evolutionary Games** - Simulate population dynamics
+        - **Extensive Form Games** - Solve sequential games by backward induction
         
         ### What is Game Theory?
         Game theory is the mathematical study of strategic decision making among rational agents. 
@@ -0,0 +1,266 @@
+"""Precomputed equilibrium atlas for 2x2 games with small integer payoffs.
+
+Every 2x2 game whose payoffs are integers in ``[low, high]`` is one point of
+a finite grid, so its equilibrium analysis can be computed once, offline,
+and stored as one fixed-size record per game. The page then answers with a
+memory-mapped O(1) lookup and only falls back to live computation for games
+outside the grid.
+
+Two kinds of atlas exist: ``symmetric`` (Player 2's payoffs are the transpose
+of Player 1's, as on the Prisoner's Dilemma page; 4 payoffs per game) and
+``bimatrix`` (8 independent payoffs per game).
+
+Build an atlas with::
+
+    python atlas.py symmetric --low 0 --high 10
+    python atlas.py bimatrix --low 0 --high 5
+"""
+
+import argparse
+import struct
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+
+ATLAS_VERSION = 2
+ATLAS_DIR = Path(__file__).parent / "data"
+
+_MAGIC = b"GTATLAS\0"
+_HEADER = struct.Struct("<8sHBbb3xQI4x")
+_KINDS = ["symmetric", "bimatrix"]
+
+RECORD_DTYPE = np.dtype([
+    ("flags", "<u2"),
+    ("p_num", "i1"), ("p_den", "i1"),
+    ("q_num", "i1"), ("q_den", "i1"),
+])
+
+# Same fields without the int8 limits, for games analyzed live
+_LIVE_DTYPE = np.dtype([(name, "<u2" if name == "flags" else "<f8") for name in RECORD_DTYPE.names])
+
+# Layout of the flags field
+MIXED_NE = 1 << 4
+P1_DOMINANCE_SHIFT = 5
+P2_DOMINANCE_SHIFT = 8
+ESS_SHIFT = 11
+
+# Range of the int8 header and record fields
+PAYOFF_MIN, PAYOFF_MAX = -128, 127
+
+DOMINANCE = ["None", "Strategy A strictly dominant", "Strategy B strictly dominant",
+             "Strategy A weakly dominant", "Strategy B weakly dominant"]
+ESS = ["Not a symmetric game", "No ESS", "Strategy A is an ESS", "Strategy B is an ESS",
+       "Both pure strategies are ESS (bistable)", "Mixed ESS"]
+
+# Chunk size for the offline builder, in games
+_CHUNK = 1 << 22
+
+
+def _dominance(first, second):
+    """Dominance code for two payoff rows of shape (n, 2)."""
+    strict_a = np.all(first > second, axis=1)
+    strict_b = np.all(second > first, axis=1)
+    differ = np.any(first != second, axis=1)
+    weak_a = np.all(first >= second, axis=1) & differ
+    weak_b = np.all(second >= first, axis=1) & differ
+    return np.select([strict_a, strict_b, weak_a, weak_b], [1, 2, 3, 4], 0)
+
+
+def _ess(A):
+    """ESS code of the symmetric game with payoff matrices A of shape (n, 2, 2)."""
+    a11, a12, a21, a22 = A[:, 0, 0], A[:, 0, 1], A[:, 1, 0], A[:, 1, 1]
+    a_ess = (a11 > a21) | ((a11 == a21) & (a12 > a22))
+    b_ess = (a22 > a12) | ((a22 == a12) & (a21 > a11))
+    mixed = (a11 < a21) & (a22 < a12)
+    return np.select([a_ess & b_ess, a_ess, b_ess, mixed], [4, 2, 3, 5], 1)
+
+
+def classify(p1, p2, dtype=RECORD_DTYPE):
+    """Equilibrium records for a batch of 2x2 games of shape (n, 2, 2).
+
+    Used both by the offline builder and as the live fallback, so atlas and
+    fallback always agree.
+    """
+    A = np.asarray(p1).reshape(-1, 2, 2)
+    B = np.asarray(p2).reshape(-1, 2, 2)
+    records = np.zeros(A.shape[0], dtype=dtype)
+
+    # Pure equilibria: bit 2*i + j is set when cell (i, j) is an equilibrium
+    is_nash = (A >= A.max(axis=1, keepdims=True)) & (B >= B.max(axis=2, keepdims=True))
+    flags = (is_nash.reshape(-1, 4) * np.array([1, 2, 4, 8])).sum(axis=1)
+
+    # Interior mixed equilibrium from the indifference conditions, kept as numerator and denominator
+    p_num = B[:, 1, 1] - B[:, 1, 0]
+    p_den = (B[:, 0, 0] - B[:, 1, 0]) - (B[:, 0, 1] - B[:, 1, 1])
+    q_num = A[:, 1, 1] - A[:, 0, 1]
+    q_den = (A[:, 0, 0] - A[:, 0, 1]) - (A[:, 1, 0] - A[:, 1, 1])
+    p_sign = np.where(p_den < 0, -1, 1)
+    q_sign = np.where(q_den < 0, -1, 1)
+    p_num, p_den = p_num * p_sign, p_den * p_sign
+    q_num, q_den = q_num * q_sign, q_den * q_sign
+    mixed = (p_den != 0) & (q_den != 0) & (0 <= p_num) & (p_num <= p_den) & (0 <= q_num) & (q_num <= q_den)
+    flags |= np.where(mixed, MIXED_NE, 0)
+
+    flags |= _dominance(A[:, 0], A[:, 1]) << P1_DOMINANCE_SHIFT
+    flags |= _dominance(B[:, :, 0], B[:, :, 1]) << P2_DOMINANCE_SHIFT
+
+    symmetric = np.all(B == A.transpose(0, 2, 1), axis=(1, 2))
+    flags |= np.where(symmetric, _ess(A), 0) << ESS_SHIFT
+
+    records["flags"] = flags
+    records["p_num"], records["p_den"] = p_num, p_den
+    records["q_num"], records["q_den"] = q_num, q_den
+    return records
+
+
+def decode(record):
+    """Readable summary of one atlas record."""
+    flags = int(record["flags"])
+    mixed = None
+    if flags & MIXED_NE:
+        mixed = (float(record["p_num"]) / float(record["p_den"]),
+                 float(record["q_num"]) / float(record["q_den"]))
+    return {
+        "pure_equilibria": [(i, j) for i in range(2) for j in range(2) if flags >> (2 * i + j) & 1],
+        "mixed_equilibrium": mixed,
+        "p1_dominance": DOMINANCE[flags >> P1_DOMINANCE_SHIFT & 7],
+        "p2_dominance": DOMINANCE[flags >> P2_DOMINANCE_SHIFT & 7],
+        "ess": ESS[flags >> ESS_SHIFT & 7],
+    }
+
+
+def _games_for_indices(kind, low, high, indices):
+    """Decode flat atlas indices into (p1, p2) payoff arrays."""
+    base = high - low + 1
+    n_digits = 4 if kind == "symmetric" else 8
+    digits = np.empty((indices.size, n_digits), dtype=np.int64)
+    rest = indices.copy()
+    for d in range(n_digits - 1, -1, -1):
+        rest, digits[:, d] = np.divmod(rest, base)
+    payoffs = digits + low
+    A = payoffs[:, :4].reshape(-1, 2, 2)
+    B = A.transpose(0, 2, 1) if kind == "symmetric" else payoffs[:, 4:].reshape(-1, 2, 2)
+    return A, B
+
+
+def atlas_path(kind, low, high):
+    return ATLAS_DIR / f"{kind}_{low}_{high}.atlas"
+
+
+def build_atlas(kind, low, high, path=None):
+    """Compute the records for every game of the grid and write the atlas file."""
+    if kind not in _KINDS:
+        raise ValueError(f"Unknown atlas kind '{kind}'.")
+    if not PAYOFF_MIN <= low <= high <= PAYOFF_MAX:
+        raise ValueError(f"Payoffs must lie between {PAYOFF_MIN} and {PAYOFF_MAX} to be stored as int8.")
+    if not 0 < high - low <= 31:
+        raise ValueError("The payoff range must hold between 2 and 32 values so fractions fit in int8.")
+
+    path = Path(path) if path is not None else atlas_path(kind, low, high)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = (high - low + 1) ** (4 if kind == "symmetric" else 8)
+
+    crc = 0
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, ATLAS_VERSION, _KINDS.index(kind), low, high, count, 0))
+        for start in range(0, count, _CHUNK):
+            indices = np.arange(start, min(start + _CHUNK, count), dtype=np.int64)
+            chunk = classify(*_games_for_indices(kind, low, high, indices)).tobytes()
+            crc = zlib.crc32(chunk, crc)
+            f.write(chunk)
+        f.seek(0)
+        f.write(_HEADER.pack(_MAGIC, ATLAS_VERSION, _KINDS.index(kind), low, high, count, crc))
+    return path
+
+
+class EquilibriumAtlas:
+    """Read-only, memory-mapped view of an atlas file."""
+
+    def __init__(self, path, verify=True):
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+        magic, version, kind, low, high, count, crc = _HEADER.unpack(header)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not an equilibrium atlas.")
+        if version != ATLAS_VERSION:
+            raise ValueError(f"{path} has atlas version {version}, expected {ATLAS_VERSION}.")
+
+        self.kind = _KINDS[kind]
+        self.low, self.high = low, high
+        self.records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=_HEADER.size, shape=(count,))
+        if verify and zlib.crc32(self.records) != crc:
+            raise ValueError(f"{path} failed its checksum; rebuild it with atlas.py.")
+
+    def index(self, p1, p2):
+        """Flat record index of a game, or None if the game is outside this atlas."""
+        A = np.asarray(p1)
+        B = np.asarray(p2)
+        payoffs = np.concatenate([A.ravel(), B.ravel()])
+        if not np.all(payoffs == np.round(payoffs)):
+            return None
+        if payoffs.min() < self.low or payoffs.max() > self.high:
+            return None
+
+        if self.kind == "symmetric":
+            if not np.array_equal(B, A.T):
+                return None
+            digits = A.ravel()
+        else:
+            digits = payoffs
+        base = self.high - self.low + 1
+        index = 0
+        for d in digits.astype(np.int64) - self.low:
+            index = index * base + int(d)
+        return index
+
+    def lookup(self, p1, p2):
+        index = self.index(p1, p2)
+        return None if index is None else self.records[index]
+
+
+_loaded = {}
+
+
+def load_atlas(kind, low, high):
+    """Open the atlas for this grid, or return None if it is missing or invalid.
+
+    Opened atlases are kept for the life of the process; failures are not
+    cached, so an atlas built while the app is running is picked up.
+    """
+    key = (kind, low, high)
+    if key not in _loaded:
+        try:
+            _loaded[key] = EquilibriumAtlas(atlas_path(kind, low, high))
+        except (OSError, ValueError):
+            return None
+    return _loaded[key]
+
+
+def analyze(p1, p2, kind="bimatrix", low=0, high=5):
+    """Equilibrium summary of a 2x2 game, from the atlas when possible.
+
+    Returns ``(summary, source)`` where ``source`` is ``"atlas"`` or ``"live"``.
+    """
+    atlas = load_atlas(kind, low, high)
+    record = atlas.lookup(p1, p2) if atlas is not None else None
+    if record is not None:
+        return decode(record), "atlas"
+
+    return decode(classify(np.asarray(p1, dtype=float), np.asarray(p2, dtype=float), _LIVE_DTYPE)[0]), "live"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build an equilibrium atlas for integer 2x2 games.")
+    parser.add_argument("kind", choices=_KINDS)
+    parser.add_argument("--low", type=int, default=0, help="smallest payoff (default: 0)")
+    parser.add_argument("--high", type=int, default=10, help="largest payoff (default: 10)")
+    parser.add_argument("--output", help="output file (default: data/<kind>_<low>_<high>.atlas)")
+    args = parser.parse_args()
+
+    try:
+        written = build_atlas(args.kind, args.low, args.high, args.output)
+    except ValueError as error:
+        parser.error(str(error))
+    print(f"Wrote {written} ({written.stat().st_size / 1e6:.1f} MB)")
@@ -0,0 +1,406 @@
+"""Compute backends for the hot loops of the demo pages.
+
+Every kernel has a reference NumPy implementation, an optional JIT-compiled
+implementation (only when ``numba`` is installed) and a multiprocess
+implementation that splits the batch axis of the NumPy version across a pool
+of worker processes. All kernels take their batch as the first axis of one or
+more arguments and return arrays whose first axis is that batch.
+
+``run()`` picks a backend from the problem size. Each backend is timed on a
+small and a large sample and checked against the NumPy reference; the fitted
+``overhead + cost * size`` models are then used to choose the fastest backend
+for every call. Backends whose results disagree with the reference are never
+selected. Calls too small to be worth a worker pool always run on NumPy.
+
+The app calibrates once at server start, in a background thread (see
+``calibrate_in_background``); until that finishes, calls run on NumPy.
+Without it, e.g. in scripts, a kernel is calibrated on its first large call.
+
+The pages only pass small batches (one game, one trajectory), so in the app
+the multiprocess backend is not selected in practice; it pays off for large
+batches, such as many games or initial conditions at once, from scripts or
+notebooks. Job workers already run in their own processes and do not use it.
+"""
+
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+BACKENDS = ["numpy", "jit", "multiprocess"]
+
+# Calls with less work than this always run on NumPy
+SMALL_WORK = 10_000
+
+logger = logging.getLogger(__name__)
+
+_KERNELS = {}
+_calibration = {}
+_pool = None
+_pool_lock = threading.Lock()
+_spawn_lock = threading.Lock()
+_startup_barrier = None
+_calibration_lock = threading.Lock()
+_calibration_thread = None
+
+# Cleared in processes that must not start a pool of their own (e.g. job workers)
+allow_multiprocess = True
+
+
+def kernel(name, batch_args, work, sample):
+    """Declare a kernel.
+
+    ``batch_args`` are the positions of the arguments whose first axis is
+    the batch; they are split together across workers. ``work`` maps the
+    call arguments to a problem size and ``sample`` builds call arguments of
+    a given size for calibration.
+    """
+    _KERNELS[name] = {"batch_args": tuple(batch_args), "work": work, "sample": sample, "impls": {}}
+
+
+def implementation(name, backend):
+    """Register ``func`` as the ``backend`` implementation of kernel ``name``."""
+    def decorator(func):
+        _KERNELS[name]["impls"][backend] = func
+        return func
+    return decorator
+
+
+def available_backends(name):
+    """Backends that can run kernel ``name`` in this process."""
+    impls = _KERNELS[name]["impls"]
+    backends = [b for b in BACKENDS if b in impls]
+    if "numpy" in impls and allow_multiprocess:
+        backends.append("multiprocess")
+    return backends
+
+
+def _workers():
+    return os.cpu_count() or 1
+
+
+def _init_pool_worker(barrier, initializer, initargs):
+    global _startup_barrier
+    _startup_barrier = barrier
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def _wait_for_pool():
+    _startup_barrier.wait(timeout=60)
+
+
+def spawn_pool(max_workers, initializer=None, initargs=()):
+    """Process pool of spawned workers, all started before it is returned.
+
+    Forking the multi-threaded Streamlit server is unsafe, and spawn re-runs
+    the main module in every new worker, which under Streamlit is the page
+    being executed. All workers are therefore started here, once, with an
+    empty main module in place; ``ProcessPoolExecutor`` never starts more
+    than ``max_workers`` processes, so later submits do not spawn again.
+    """
+    context = multiprocessing.get_context("spawn")
+    pool = ProcessPoolExecutor(max_workers, mp_context=context, initializer=_init_pool_worker,
+                               initargs=(context.Barrier(max_workers), initializer, initargs))
+    with _spawn_lock:
+        main = sys.modules["__main__"]
+        bare = sys.modules["__main__"] = types.ModuleType("__main__")
+        try:
+            # Each task waits until every worker runs one, so every submit has to spawn a new worker
+            for _ in range(max_workers):
+                pool.submit(_wait_for_pool)
+        finally:
+            # Keep a page a Streamlit rerun installed in the meantime
+            if sys.modules["__main__"] is bare:
+                sys.modules["__main__"] = main
+    return pool
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = spawn_pool(_workers())
+        return _pool
+
+
+def _call_numpy(name, args):
+    return _KERNELS[name]["impls"]["numpy"](*args)
+
+
+def _run_multiprocess(name, args):
+    """Split the batch arguments into one chunk per worker and concatenate the results."""
+    batch_args = _KERNELS[name]["batch_args"]
+    bounds = np.linspace(0, len(args[batch_args[0]]), _workers() + 1).astype(int)
+    futures = []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        if stop > start:
+            chunk = tuple(a[start:stop] if i in batch_args else a for i, a in enumerate(args))
+            futures.append(_get_pool().submit(_call_numpy, name, chunk))
+    results = [f.result() for f in futures]
+    if isinstance(results[0], tuple):
+        return tuple(np.concatenate(parts) for parts in zip(*results))
+    return np.concatenate(results)
+
+
+def _execute(name, backend, args):
+    if backend == "multiprocess":
+        return _run_multiprocess(name, args)
+    return _KERNELS[name]["impls"][backend](*args)
+
+
+def _same_result(a, b):
+    if isinstance(a, tuple):
+        return all(_same_result(x, y) for x, y in zip(a, b))
+    return np.allclose(a, b, equal_nan=True)
+
+
+def calibrate(name, sizes=(1_000, 200_000)):
+    """Time every backend of kernel ``name`` and check it against the NumPy reference.
+
+    Returns ``{backend: (overhead_seconds, seconds_per_unit)}``; backends that
+    fail or disagree with the reference are left out.
+    """
+    spec = _KERNELS[name]
+    samples = [spec["sample"](size) for size in sizes]
+    references = [_execute(name, "numpy", args) for args in samples]
+
+    models = {}
+    for backend in available_backends(name):
+        try:
+            # Warm-up call: triggers JIT compilation or starts the worker pool
+            _execute(name, backend, samples[0])
+            timings = []
+            for args, reference in zip(samples, references):
+                start = time.perf_counter()
+                result = _execute(name, backend, args)
+                timings.append(time.perf_counter() - start)
+                if not _same_result(result, reference):
+                    raise ValueError(f"{backend} disagrees with the NumPy reference")
+        except Exception as error:
+            logger.warning("Backend '%s' excluded for kernel '%s': %s", backend, name, error)
+            continue
+
+        work = [spec["work"](args) for args in samples]
+        cost = max((timings[1] - timings[0]) / (work[1] - work[0]), 0.0)
+        overhead = max(timings[0] - cost * work[0], 0.0)
+        models[backend] = (overhead, cost)
+
+    _calibration[name] = models
+    return models
+
+
+def calibrate_all():
+    """Calibrate every kernel that has not been calibrated in this process yet."""
+    with _calibration_lock:
+        for name in _KERNELS:
+            if name not in _calibration:
+                calibrate(name)
+
+
+def calibrate_in_background():
+    """Start calibrating every kernel in a background thread, once per process."""
+    global _calibration_thread
+    with _calibration_lock:
+        if _calibration_thread is None:
+            _calibration_thread = threading.Thread(target=calibrate_all, name="backend-calibration", daemon=True)
+            _calibration_thread.start()
+        return _calibration_thread
+
+
+def select_backend(name, *args):
+    """Backend predicted to be fastest for this call."""
+    size = _KERNELS[name]["work"](args)
+    if size < SMALL_WORK:
+        return "numpy"
+    if name not in _calibration:
+        if _calibration_thread is not None and _calibration_thread.is_alive():
+            # Do not wait for, or duplicate, the calibration running in the background
+            return "numpy"
+        with _calibration_lock:
+            if name not in _calibration:
+                calibrate(name)
+    models = _calibration[name] or {"numpy": (0.0, 0.0)}
+    return min(models, key=lambda b: models[b][0] + models[b][1] * size)
+
+
+def run(name, *args, backend=None):
+    """Run kernel ``name`` on the given backend, or on the fastest one for this size."""
+    if backend is None:
+        backend = select_backend(name, *args)
+    elif backend not in available_backends(name):
+        raise ValueError(f"Backend '{backend}' is not available for kernel '{name}'.")
+    return _execute(name, backend, args)
+
+
+# ---------------------------------------------------------------------------
+# Replicator dynamics: one trajectory per initial frequency of Strategy A
+
+def _replicator_sample(size):
+    rng = np.random.default_rng(0)
+    generations = 100
+    return (rng.normal(size=(2, 2)), rng.random(max(size // generations, 1)), generations, 1.0)
+
+
+kernel(
+    "replicator",
+    batch_args=(1,),
+    work=lambda args: len(args[1]) * args[2],
+    sample=_replicator_sample,
+)
+
+
+@implementation("replicator", "numpy")
+def replicator_numpy(payoff_matrix, initial_freq, generations, selection_strength):
+    """Discrete replicator updates; returns (freq_a, fitness_a, fitness_b, avg_fitness)."""
+    runs = len(initial_freq)
+    freq_a = np.zeros((runs, generations + 1))
+    freq_a[:, 0] = initial_freq
+    fitness_a = np.zeros((runs, generations))
+    fitness_b = np.zeros((runs, generations))
+    avg_fitness = np.zeros((runs, generations))
+
+    for t in range(generations):
+        p = freq_a[:, t]
+        q = 1 - p
+        fitness_a[:, t] = p * payoff_matrix[0, 0] + q * payoff_matrix[0, 1]
+        fitness_b[:, t] = p * payoff_matrix[1, 0] + q * payoff_matrix[1, 1]
+        avg_fitness[:, t] = p * fitness_a[:, t] + q * fitness_b[:, t]
+
+        delta_p = p * (fitness_a[:, t] - avg_fitness[:, t]) * selection_strength * 0.01
+        freq_a[:, t + 1] = np.where(avg_fitness[:, t] != 0, np.clip(p + delta_p, 0, 1), p)
+
+    return freq_a, fitness_a, fitness_b, avg_fitness
+
+
+# ---------------------------------------------------------------------------
+# Direction field dp/dt of the single-population replicator equation
+
+def _direction_field_sample(size):
+    rng = np.random.default_rng(0)
+    return (rng.normal(size=(2, 2)), np.linspace(0, 1, size), 1.0)
+
+
+kernel(
+    "direction_field",
+    batch_args=(1,),
+    work=lambda args: len(args[1]),
+    sample=_direction_field_sample,
+)
+
+
+@implementation("direction_field", "numpy")
+def direction_field_numpy(payoff_matrix, p_values, selection_strength):
+    p = np.asarray(p_values, dtype=float)
+    q = 1 - p
+    fitness_a = p * payoff_matrix[0, 0] + q * payoff_matrix[0, 1]
+    fitness_b = p * payoff_matrix[1, 0] + q * payoff_matrix[1, 1]
+    avg_fitness = p * fitness_a + q * fitness_b
+    interior = (p > 0) & (p < 1)
+    return np.where(interior, p * (fitness_a - avg_fitness) * selection_strength, 0.0)
+
+
+# ---------------------------------------------------------------------------
+# Pure Nash equilibrium check for every cell of a batch of bimatrix games
+
+def _pure_nash_sample(size):
+    rng = np.random.default_rng(0)
+    n = 10
+    games = max(size // (n * n), 1)
+    return (rng.integers(0, 5, (games, n, n)), rng.integers(0, 5, (games, n, n)))
+
+
+kernel(
+    "pure_nash",
+    batch_args=(0, 1),
+    work=lambda args: args[0].size,
+    sample=_pure_nash_sample,
+)
+
+
+@implementation("pure_nash", "numpy")
+def pure_nash_numpy(payoff_p1, payoff_p2):
+    """Boolean mask of cells where both players are playing a best response.
+
+    ``payoff_p1`` and ``payoff_p2`` have shape ``(games, rows, columns)``.
+    """
+    p1_best = payoff_p1 >= payoff_p1.max(axis=1, keepdims=True)
+    p2_best = payoff_p2 >= payoff_p2.max(axis=2, keepdims=True)
+    return p1_best & p2_best
+
+
+# ---------------------------------------------------------------------------
+# JIT-compiled implementations
+
+if numba is not None:
+
+    @implementation("replicator", "jit")
+    @numba.njit
+    def replicator_jit(payoff_matrix, initial_freq, generations, selection_strength):
+        runs = len(initial_freq)
+        freq_a = np.zeros((runs, generations + 1))
+        fitness_a = np.zeros((runs, generations))
+        fitness_b = np.zeros((runs, generations))
+        avg_fitness = np.zeros((runs, generations))
+
+        for r in range(runs):
+            p = initial_freq[r]
+            freq_a[r, 0] = p
+            for t in range(generations):
+                q = 1 - p
+                fa = p * payoff_matrix[0, 0] + q * payoff_matrix[0, 1]
+                fb = p * payoff_matrix[1, 0] + q * payoff_matrix[1, 1]
+                avg = p * fa + q * fb
+                fitness_a[r, t] = fa
+                fitness_b[r, t] = fb
+                avg_fitness[r, t] = avg
+                if avg != 0:
+                    p = min(max(p + p * (fa - avg) * selection_strength * 0.01, 0.0), 1.0)
+                freq_a[r, t + 1] = p
+
+        return freq_a, fitness_a, fitness_b, avg_fitness
+
+    @implementation("direction_field", "jit")
+    @numba.njit
+    def direction_field_jit(payoff_matrix, p_values, selection_strength):
+        dp_dt = np.zeros(len(p_values))
+        for i in range(len(p_values)):
+            p = p_values[i]
+            if 0 < p < 1:
+                q = 1 - p
+                fa = p * payoff_matrix[0, 0] + q * payoff_matrix[0, 1]
+                fb = p * payoff_matrix[1, 0] + q * payoff_matrix[1, 1]
+                dp_dt[i] = p * (fa - (p * fa + q * fb)) * selection_strength
+        return dp_dt
+
+    @implementation("pure_nash", "jit")
+    @numba.njit
+    def pure_nash_jit(payoff_p1, payoff_p2):
+        games, rows, cols = payoff_p1.shape
+        mask = np.zeros((games, rows, cols), dtype=np.bool_)
+        for g in range(games):
+            for j in range(cols):
+                best = payoff_p1[g, 0, j]
+                for i in range(1, rows):
+                    best = max(best, payoff_p1[g, i, j])
+                for i in range(rows):
+                    mask[g, i, j] = payoff_p1[g, i, j] >= best
+            for i in range(rows):
+                best = payoff_p2[g, i, 0]
+                for j in range(1, cols):
+                    best = max(best, payoff_p2[g, i, j])
+                for j in range(cols):
+                    mask[g, i, j] = mask[g, i, j] and payoff_p2[g, i, j] >= best
+        return mask
@@ -0,0 +1,54 @@
+"""Thread-safe in-memory cache shared by the analysis modules.
+
+Streamlit runs every browser session in its own thread, so a module-level
+cache is read and updated by several threads at once. ``LRUCache`` guards
+its bookkeeping with a lock; values are computed outside the lock so a slow
+computation for one game does not hold up lookups for others.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def array_key(*arrays, extra=()):
+    """Hash identifying arrays by their contents and shapes, plus any ``extra`` values."""
+    digest = hashlib.sha1()
+    for a in arrays:
+        a = np.ascontiguousarray(a, dtype=float)
+        digest.update(a.tobytes())
+        digest.update(str(a.shape).encode())
+    digest.update(repr(extra).encode())
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """Keeps the ``max_entries`` most recently used values."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_create(self, key, create):
+        """The value stored under ``key``, calling ``create()`` to compute it if missing.
+
+        If two threads miss the same key at once both compute it, and the
+        value stored first is returned to both.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        value = create()
+        with self._lock:
+            value = self._entries.setdefault(key, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
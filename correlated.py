@@ -0,0 +1,283 @@
+"""Correlated equilibria of bimatrix games by linear programming.
+
+A correlated equilibrium is a distribution ``p`` over strategy pairs such
+that no player gains by deviating from a recommended strategy. For an
+N x M game these are the incentive constraints
+
+    sum_j p[i, j] * (A[i, j] - A[k, j]) >= 0   for every pair of rows i != k
+    sum_i p[i, j] * (B[i, j] - B[i, l]) >= 0   for every pair of columns j != l
+
+so the full problem has N*M variables and N(N-1) + M(M-1) dense-ish
+constraints: about 54 million non-zeros for a 300 x 300 game. The solver
+therefore works on a restricted problem and grows it on demand:
+
+- only a set of active strategy pairs are variables; pairs outside it
+  enter when their reduced cost shows they would improve the objective,
+  the most improving ones first, up to doubling the set each round;
+- incentive constraints are added when the current solution violates
+  them, the most violated one per recommendation at a time.
+
+A single slack variable with a large cost keeps every restricted problem
+feasible. When no pair can improve the objective and no constraint is
+violated, the restricted solution is optimal for the full problem. Games
+whose equilibria need most strategy pairs gain nothing from this, so once
+the restricted problem has grown to ``full_fraction`` of the full one, the
+full problem is solved directly if it is small enough. Each round's
+constraints are assembled as one sparse matrix from index arrays.
+
+This is fast when an optimal equilibrium needs a small part of the game:
+random games with independent payoffs up to 300 x 300 usually take a
+few seconds at most. Zero-sum (and constant-sum)
+games are the worst case, but there every correlated equilibrium gives both
+players the value of the game, so for the named objectives the product of
+the two minimax strategies is returned; it takes two LPs with N + M
+constraints in total. Games close to zero-sum get no such shortcut and
+need most strategy pairs: beyond about 30 x 30 they are stopped at
+``max_nonzeros`` constraint entries or after ``time_limit`` seconds with a
+``RuntimeError``.
+"""
+
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import linprog
+
+
+OBJECTIVES = ["Maximize total payoff", "Maximize Player 1's payoff", "Maximize Player 2's payoff"]
+
+# Largest constraint matrix assembled (about 12 bytes per entry, several copies inside the solver)
+MAX_NONZEROS = 5_000_000
+
+# Seconds spent in the LP solver before giving up
+TIME_LIMIT = 30.0
+
+
+def _objective(A, B, objective):
+    if isinstance(objective, str):
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective '{objective}'; choose from {OBJECTIVES} or pass a weight matrix.")
+        return [A + B, A, B][OBJECTIVES.index(objective)]
+    weights = np.asarray(objective, dtype=float)
+    if weights.shape != A.shape:
+        raise ValueError("Objective weights must have the same shape as the payoff matrices.")
+    return weights
+
+
+def _ranges(starts, counts):
+    """Concatenation of ``arange(start, start + count)`` for every start and count."""
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return offsets + np.arange(counts.sum())
+
+
+def incentive_constraints(p1_matrix, p2_matrix, cells=None, deviations_1=None, deviations_2=None):
+    """Incentive constraints in the form ``G @ p <= 0`` as a sparse matrix.
+
+    Variables are the strategy pairs ``cells``, given as sorted row-major
+    indices into the N x M game (all pairs by default). ``deviations_1`` is
+    a pair of index arrays ``(i, k)``, one constraint per entry: Player 1
+    told to play row ``i`` does not gain by playing row ``k``;
+    ``deviations_2`` is the same for Player 2's columns. By default every
+    deviation is included.
+    """
+    A = np.asarray(p1_matrix, dtype=float)
+    B = np.asarray(p2_matrix, dtype=float)
+    n, m = A.shape
+    cells = np.arange(n * m) if cells is None else np.asarray(cells)
+    if deviations_1 is None:
+        deviations_1 = np.nonzero(~np.eye(n, dtype=bool))
+    if deviations_2 is None:
+        deviations_2 = np.nonzero(~np.eye(m, dtype=bool))
+    cell_rows, cell_cols = np.divmod(cells, m)
+
+    # Player 1: constraint (i, k) touches every variable in row i, a contiguous run of cells
+    i, k = deviations_1
+    row_counts = np.bincount(cell_rows, minlength=n)
+    row_starts = np.cumsum(row_counts) - row_counts
+    var_1 = _ranges(row_starts[i], row_counts[i])
+    con_1 = np.repeat(np.arange(len(i)), row_counts[i])
+    data_1 = A[np.repeat(k, row_counts[i]), cell_cols[var_1]] - A[cell_rows[var_1], cell_cols[var_1]]
+
+    # Player 2: constraint (j, l) touches every variable in column j
+    j, l = deviations_2
+    by_col = np.argsort(cell_cols, kind="stable")
+    col_counts = np.bincount(cell_cols, minlength=m)
+    col_starts = np.cumsum(col_counts) - col_counts
+    var_2 = by_col[_ranges(col_starts[j], col_counts[j])]
+    con_2 = np.repeat(np.arange(len(j)), col_counts[j]) + len(i)
+    data_2 = B[cell_rows[var_2], np.repeat(l, col_counts[j])] - B[cell_rows[var_2], cell_cols[var_2]]
+
+    return sp.csr_matrix(
+        (np.concatenate([data_1, data_2]), (np.concatenate([con_1, con_2]), np.concatenate([var_1, var_2]))),
+        shape=(len(i) + len(j), len(cells)),
+    )
+
+
+def incentive_gains(p1_matrix, p2_matrix, distribution):
+    """Expected gain of obeying each recommendation instead of each deviation.
+
+    Returns ``(gains_1, gains_2)`` of shapes (N, N) and (M, M); a
+    distribution is a correlated equilibrium when no gain is negative.
+    """
+    A = np.asarray(p1_matrix, dtype=float)
+    B = np.asarray(p2_matrix, dtype=float)
+    P = np.asarray(distribution, dtype=float)
+    gains_1 = (P * A).sum(axis=1)[:, None] - P @ A.T
+    gains_2 = (P * B).sum(axis=0)[:, None] - P.T @ B
+    return gains_1, gains_2
+
+
+def _linprog(c, deadline, time_limit, **kwargs):
+    """``linprog`` with HiGHS, raising ``RuntimeError`` unless it finds the optimum before ``deadline``."""
+    remaining = max(deadline - time.perf_counter(), 1e-3)
+    result = linprog(c, method="highs", options={"time_limit": remaining}, **kwargs)
+    if result.status == 1:
+        raise RuntimeError(f"Correlated equilibrium not found within the {time_limit:g} s time limit.")
+    if result.status != 0:
+        raise RuntimeError(f"Correlated equilibrium LP failed: {result.message}")
+    return result
+
+
+def _minimax_strategy(A, deadline, time_limit):
+    """Maximin mixed strategy of the row player of the zero-sum game ``A``."""
+    n, m = A.shape
+    # Variables (x, v): maximize v subject to x @ A[:, j] >= v for every column j
+    result = _linprog(
+        np.append(np.zeros(n), -1.0), deadline, time_limit,
+        A_ub=np.hstack([-A.T, np.ones((m, 1))]), b_ub=np.zeros(m),
+        A_eq=np.append(np.ones(n), 0.0)[None, :], b_eq=[1.0],
+        bounds=[(0, None)] * n + [(None, None)],
+    )
+    x = np.maximum(result.x[:n], 0)
+    return x / x.sum()
+
+
+def correlated_equilibrium(p1_matrix, p2_matrix, objective="Maximize total payoff", tol=1e-7,
+                           cells_per_round=50, full_fraction=0.25, max_nonzeros=MAX_NONZEROS,
+                           time_limit=TIME_LIMIT):
+    """Correlated equilibrium maximizing ``objective``.
+
+    ``objective`` is one of ``OBJECTIVES`` or an N x M matrix of weights,
+    maximizing ``sum(weights * p)``. Returns ``(distribution, info)``:
+    the N x M probability of each strategy pair, and a dict with the time
+    spent assembling constraints, solving LPs and pricing (reduced costs and
+    the search for violated constraints), the number of rounds and the
+    final number of variables and constraints.
+
+    ``tol`` is relative to the largest payoff and should not be below the
+    LP solver's own feasibility tolerance (1e-7), or rounds are spent on
+    violations the solver cannot resolve.
+
+    Raises ``RuntimeError`` if the search takes more than ``time_limit``
+    seconds or would need more than ``max_nonzeros`` constraint entries.
+    """
+    A = np.asarray(p1_matrix, dtype=float)
+    B = np.asarray(p2_matrix, dtype=float)
+    if A.shape != B.shape:
+        raise ValueError("Both payoff matrices must have the same shape.")
+    n, m = A.shape
+    W = _objective(A, B, objective)
+    tol = tol * max(np.abs(A).max(), np.abs(B).max(), 1.0)
+    full_constraints = n * (n - 1) + m * (m - 1)
+    deadline = time.perf_counter() + time_limit
+
+    if isinstance(objective, str) and np.ptp(A + B) <= tol:
+        # Constant-sum game: every correlated equilibrium pays both players the value
+        start = time.perf_counter()
+        x = _minimax_strategy(A, deadline, time_limit)
+        y = _minimax_strategy(B.T, deadline, time_limit)
+        info = {"build_time": 0.0, "solve_time": time.perf_counter() - start, "pricing_time": 0.0,
+                "rounds": 0, "variables": n + m, "constraints": n + m,
+                "full_constraints": full_constraints}
+        return np.outer(x, y), info
+
+    # Start from the single best pair. The slack relaxes constraints measured in
+    # payoffs, so its cost follows the payoff scale; it grows if it ever binds.
+    active = np.zeros(n * m, dtype=bool)
+    active[np.argmax(W)] = True
+    included_1 = np.zeros((n, n), dtype=bool)
+    included_2 = np.zeros((m, m), dtype=bool)
+    slack_cost = 100 * max(np.abs(W).max(), np.abs(A).max(), np.abs(B).max()) + 1
+    full_nnz = n * m * (n + m - 2)
+    full = False
+
+    build_time = solve_time = pricing_time = 0.0
+    rounds = 0
+    while True:
+        rounds += 1
+        start = time.perf_counter()
+        cells = np.flatnonzero(active)
+        deviations_1, deviations_2 = np.nonzero(included_1), np.nonzero(included_2)
+        cell_rows, cell_cols = np.divmod(cells, m)
+        nonzeros = (np.bincount(cell_rows, minlength=n)[deviations_1[0]].sum()
+                    + np.bincount(cell_cols, minlength=m)[deviations_2[0]].sum())
+        if nonzeros > max_nonzeros:
+            raise RuntimeError(f"This game needs more than {max_nonzeros:,} constraint entries; "
+                               "its correlated equilibria use too many strategy pairs to compute here.")
+        G = incentive_constraints(A, B, cells, deviations_1, deviations_2)
+        n_constraints, n_variables = G.shape
+        # The slack variable relaxes every constraint by the same amount
+        G = sp.hstack([G, -np.ones((n_constraints, 1))], format="csr")
+        build_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = _linprog(
+            np.append(-W.ravel()[cells], slack_cost), deadline, time_limit,
+            A_ub=G if n_constraints else None,
+            b_ub=np.zeros(n_constraints) if n_constraints else None,
+            A_eq=np.append(np.ones(n_variables), 0.0)[None, :], b_eq=[1.0],
+            # The full problem always has a solution (every Nash equilibrium is one), so no slack
+            bounds=[(0, None)] * n_variables + [(0, 0 if full else None)],
+        )
+        solve_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        P = np.zeros(n * m)
+        P[cells] = np.maximum(result.x[:-1], 0)
+        P = P.reshape(n, m)
+
+        # Reduced cost of every strategy pair from the duals of the included constraints
+        duals = result.ineqlin.marginals if n_constraints else np.zeros(0)
+        Y1 = np.zeros((n, n))
+        Y1[deviations_1] = duals[:len(deviations_1[0])]
+        Y2 = np.zeros((m, m))
+        Y2[deviations_2] = duals[len(deviations_1[0]):]
+        reduced = (-W - result.eqlin.marginals[0]
+                   - (Y1 @ A - Y1.sum(axis=1)[:, None] * A)
+                   - (B @ Y2.T - Y2.sum(axis=1)[None, :] * B))
+        improving = np.flatnonzero(reduced.ravel() < -tol)
+
+        gains_1, gains_2 = incentive_gains(A, B, P)
+        violated_1 = (gains_1 < -tol) & ~included_1
+        violated_2 = (gains_2 < -tol) & ~included_2
+        # Only the most profitable deviation from each recommendation; the rest often follow
+        violated_1 &= gains_1 <= np.where(violated_1, gains_1, 0.0).min(axis=1, keepdims=True)
+        violated_2 &= gains_2 <= np.where(violated_2, gains_2, 0.0).min(axis=1, keepdims=True)
+        pricing_time += time.perf_counter() - start
+
+        if not improving.size and not violated_1.any() and not violated_2.any():
+            if result.x[-1] <= tol:
+                break
+            slack_cost *= 10
+            continue
+
+        included_1 |= violated_1
+        included_2 |= violated_2
+        # Add as many pairs as are already active, at least cells_per_round, so a problem that
+        # keeps growing reaches its final size in few rounds
+        batch = max(cells_per_round, int(active.sum()))
+        active[improving[np.argsort(reduced.ravel()[improving])[:batch]]] = True
+
+        # Games whose equilibria need much of the problem converge slowly this way;
+        # solve the full problem instead if it is small enough
+        grown = G.nnz > full_fraction * full_nnz or active.sum() > full_fraction * n * m
+        if grown and full_nnz <= max_nonzeros:
+            active[:] = True
+            included_1 = ~np.eye(n, dtype=bool)
+            included_2 = ~np.eye(m, dtype=bool)
+            full = True
+
+    info = {"build_time": build_time, "solve_time": solve_time, "pricing_time": pricing_time,
+            "rounds": rounds, "variables": n_variables, "constraints": n_constraints,
+            "full_constraints": full_constraints}
+    return P, info
@@ -0,0 +1,107 @@
+"""Replicator dynamics for evolutionary games."""
+
+import numpy as np
+
+
+# Outcome codes returned by bimatrix_replicator()
+RUNNING = 0
+CONVERGED = 1
+CYCLING = 2
+
+
+def mixed_equilibrium(p1_matrix, p2_matrix):
+    """Interior mixed equilibrium of a 2x2 bimatrix game from the indifference conditions.
+
+    Returns ``(p, q)``, the probabilities that Player 1 and Player 2 play
+    Strategy A, or ``None`` when there is no equilibrium inside the unit square.
+    """
+    A = np.asarray(p1_matrix, dtype=float)
+    B = np.asarray(p2_matrix, dtype=float)
+
+    # Player 1 mixes so that Player 2 is indifferent, and vice versa
+    denominator_p = (B[0, 0] - B[1, 0]) - (B[0, 1] - B[1, 1])
+    denominator_q = (A[0, 0] - A[0, 1]) - (A[1, 0] - A[1, 1])
+    if abs(denominator_p) < 1e-10 or abs(denominator_q) < 1e-10:
+        return None
+
+    p = (B[1, 1] - B[1, 0]) / denominator_p
+    q = (A[1, 1] - A[0, 1]) / denominator_q
+    if 0 <= p <= 1 and 0 <= q <= 1:
+        return p, q
+    return None
+
+
+def bimatrix_field(p1_matrix, p2_matrix, x, y):
+    """Two-population replicator velocity (dx/dt, dy/dt) at arrays of points.
+
+    ``x`` is the share of population 1 playing Strategy A (the rows) and
+    ``y`` the share of population 2 playing Strategy A (the columns).
+    """
+    A = np.asarray(p1_matrix, dtype=float)
+    B = np.asarray(p2_matrix, dtype=float)
+
+    # Fitness advantage of Strategy A over Strategy B in each population
+    advantage_1 = (A[0, 1] - A[1, 1]) + ((A[0, 0] - A[1, 0]) - (A[0, 1] - A[1, 1])) * y
+    advantage_2 = (B[1, 0] - B[1, 1]) + ((B[0, 0] - B[0, 1]) - (B[1, 0] - B[1, 1])) * x
+    return x * (1 - x) * advantage_1, y * (1 - y) * advantage_2
+
+
+def bimatrix_replicator(p1_matrix, p2_matrix, x0, y0, steps=2000, dt=0.01,
+                        cycle_tol=1e-2, converge_tol=1e-6, progress=None):
+    """Evolve many (x, y) starting points of the two-population replicator jointly.
+
+    All runs are advanced together with one vectorized RK4 step per time
+    step. A run stops early once it converges (speed below ``converge_tol``)
+    or closes an orbit, i.e. comes back within ``cycle_tol`` of its start
+    after having moved away from it, as the neutral cycles of Matching
+    Pennies do. Stopped runs keep their last position.
+
+    Returns ``(trajectories, status, stop_step)`` where ``trajectories`` has
+    shape ``(T + 1, runs, 2)`` with ``T <= steps``, ``status`` holds
+    ``RUNNING``, ``CONVERGED`` or ``CYCLING`` per run and ``stop_step`` is the
+    step at which each run stopped (``steps`` for runs that never stopped).
+    ``progress``, if given, is called with the completed fraction after every
+    step.
+    """
+    state = np.stack(np.broadcast_arrays(np.asarray(x0, dtype=float),
+                                         np.asarray(y0, dtype=float)), axis=-1).reshape(-1, 2)
+    runs = state.shape[0]
+
+    def velocity(s):
+        return np.stack(bimatrix_field(p1_matrix, p2_matrix, s[:, 0], s[:, 1]), axis=-1)
+
+    trajectories = np.empty((steps + 1, runs, 2))
+    trajectories[0] = state
+    status = np.full(runs, RUNNING, dtype=np.int8)
+    stop_step = np.full(runs, steps)
+    left_start = np.zeros(runs, dtype=bool)
+    active = np.arange(runs)
+
+    for t in range(steps):
+        s = state[active]
+        k1 = velocity(s)
+        k2 = velocity(s + 0.5 * dt * k1)
+        k3 = velocity(s + 0.5 * dt * k2)
+        k4 = velocity(s + dt * k3)
+        new = np.clip(s + dt / 6 * (k1 + 2 * k2 + 2 * k3 + k4), 0.0, 1.0)
+
+        state[active] = new
+        trajectories[t + 1] = state
+
+        distance = np.linalg.norm(new - trajectories[0, active], axis=1)
+        left_start[active] |= distance > 5 * cycle_tol
+        closed = left_start[active] & (distance < cycle_tol)
+        converged = np.abs(k1).max(axis=1) < converge_tol
+
+        status[active[converged]] = CONVERGED
+        status[active[closed & ~converged]] = CYCLING
+        done = closed | converged
+        stop_step[active[done]] = t + 1
+        active = active[~done]
+        if progress is not None:
+            progress((t + 1) / steps)
+        if active.size == 0:
+            trajectories = trajectories[:t + 2]
+            break
+
+    return trajectories, status, stop_step
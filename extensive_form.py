@@ -0,0 +1,356 @@
+"""Extensive-form (sequential) games stored as flat arrays.
+
+A game tree is kept as a handful of parallel NumPy arrays instead of node
+objects, so trees with tens of millions of nodes fit in a few hundred MB:
+
+- ``parent[i]``         index of the parent node (-1 for the root)
+- ``player[i]``         player to move at node ``i`` (-1 for terminal nodes)
+- ``payoff_offset[i]``  row of ``payoffs`` holding the outcome of terminal
+                        node ``i`` (-1 for decision nodes)
+
+Nodes are stored in breadth-first order with siblings contiguous, so every
+level of the tree is a contiguous slice and the children of a node are a
+contiguous run starting at ``first_child[i]``. Backward induction can then
+work one whole level at a time with ``reduceat``.
+"""
+
+import numpy as np
+
+
+# Largest random tree built (a full binary tree of depth 23 has 2^24 - 1 nodes)
+MAX_RANDOM_NODES = 1 << 24
+
+
+def _index_dtype(n):
+    """Smallest integer dtype able to address ``n`` nodes."""
+    return np.int32 if n < np.iinfo(np.int32).max else np.int64
+
+
+def _depths(parent):
+    """Depth of every node, computed by pointer jumping (O(n log depth))."""
+    depth = (parent >= 0).astype(np.int64)
+    jump = parent.astype(np.int64)
+    active = np.flatnonzero(jump >= 0)
+    while active.size:
+        ancestor = jump[active]
+        depth[active] += depth[ancestor]
+        jump[active] = jump[ancestor]
+        active = active[jump[active] >= 0]
+    return depth
+
+
+class GameTree:
+    """Perfect-information game tree in breadth-first array form."""
+
+    def __init__(self, parent, player, payoff_offset, payoffs, labels=None,
+                 player_names=None):
+        parent = np.asarray(parent)
+        n = parent.shape[0]
+        idx = _index_dtype(n)
+
+        self.parent = parent.astype(idx, copy=False)
+        self.player = np.asarray(player).astype(np.int8, copy=False)
+        self.payoff_offset = np.asarray(payoff_offset).astype(idx, copy=False)
+        self.payoffs = np.atleast_2d(np.asarray(payoffs))
+        self.labels = labels
+        self.n_players = self.payoffs.shape[1]
+        self.player_names = (list(player_names) if player_names is not None
+                             else [f"Player {k + 1}" for k in range(self.n_players)])
+
+        if self.parent[0] != -1 or np.any(self.parent[1:] < 0):
+            raise ValueError("Node 0 must be the only root; use GameTree.from_parents() "
+                             "for trees that are not in breadth-first order.")
+        if np.any(self.parent[1:] >= np.arange(1, n)) or np.any(np.diff(self.parent[1:]) < 0):
+            raise ValueError("Children must be grouped by parent in breadth-first order.")
+
+        self.n_children = np.bincount(self.parent[1:], minlength=n).astype(idx)
+        self.first_child = np.empty(n, dtype=idx)
+        self.first_child[0] = 1
+        np.cumsum(self.n_children[:-1], out=self.first_child[1:])
+        self.first_child[1:] += 1
+
+        is_leaf = self.payoff_offset >= 0
+        if np.any(is_leaf == (self.n_children > 0)):
+            raise ValueError("Exactly the nodes without children must carry payoffs.")
+        if np.any(is_leaf != (self.player < 0)):
+            raise ValueError("Decision nodes need a player; terminal nodes must use player -1.")
+        if np.any(self.player >= self.n_players):
+            raise ValueError("Player index exceeds the number of payoff columns.")
+
+        # Level boundaries: level d is nodes[level_start[d]:level_start[d + 1]].
+        starts = [0, 1]
+        while starts[-1] < n:
+            lo, hi = starts[-2], starts[-1]
+            starts.append(hi + int(self.n_children[lo:hi].sum()))
+        self.level_start = np.array(starts, dtype=np.int64)
+
+    @property
+    def n_nodes(self):
+        return self.parent.shape[0]
+
+    @property
+    def depth(self):
+        """Number of levels below the root."""
+        return len(self.level_start) - 2
+
+    @property
+    def nbytes(self):
+        """Memory used by the tree arrays, in bytes."""
+        return sum(a.nbytes for a in (self.parent, self.player, self.payoff_offset,
+                                      self.payoffs, self.n_children, self.first_child))
+
+    def is_terminal(self, node):
+        return self.payoff_offset[node] >= 0
+
+    def action_label(self, node):
+        """Label of the action leading into ``node``."""
+        if self.labels is not None:
+            return self.labels[node]
+        return f"a{node - self.first_child[self.parent[node]]}"
+
+    @classmethod
+    def from_parents(cls, parent, player, payoff_offset, payoffs, labels=None,
+                     player_names=None):
+        """Build a tree from arrays in any order by relabelling nodes breadth-first.
+
+        Siblings keep their relative order, which fixes the action numbering.
+        """
+        parent = np.asarray(parent, dtype=np.int64)
+        n = parent.shape[0]
+        if np.count_nonzero(parent < 0) != 1:
+            raise ValueError("A game tree needs exactly one root.")
+
+        depth = _depths(parent)
+        by_depth = np.argsort(depth, kind="stable")
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(depth))])
+
+        order = np.empty(n, dtype=np.int64)
+        new_pos = np.empty(n, dtype=np.int64)
+        for d in range(len(bounds) - 1):
+            lo, hi = bounds[d], bounds[d + 1]
+            nodes = by_depth[lo:hi]
+            if d > 0:
+                nodes = nodes[np.argsort(new_pos[parent[nodes]], kind="stable")]
+            order[lo:hi] = nodes
+            new_pos[nodes] = np.arange(lo, hi)
+
+        new_parent = parent[order]
+        new_parent[1:] = new_pos[new_parent[1:]]
+        if labels is not None:
+            labels = [labels[i] for i in order]
+        return cls(new_parent, np.asarray(player)[order], np.asarray(payoff_offset)[order],
+                   payoffs, labels=labels, player_names=player_names)
+
+    @classmethod
+    def from_nested(cls, spec, player_names=None):
+        """Build a small tree from a nested description.
+
+        A decision node is ``(player, {action_label: subtree, ...})`` and a
+        terminal node is a tuple of payoffs, one per player.
+        """
+        parent, player, offset, labels, payoffs = [], [], [], [], []
+        queue = [(spec, -1, None)]
+        head = 0
+        while head < len(queue):
+            node, par, label = queue[head]
+            head += 1
+            parent.append(par)
+            labels.append(label)
+            if isinstance(node, tuple) and len(node) == 2 and isinstance(node[1], dict):
+                player.append(node[0])
+                offset.append(-1)
+                for child_label, child in node[1].items():
+                    queue.append((child, head - 1, child_label))
+            else:
+                player.append(-1)
+                offset.append(len(payoffs))
+                payoffs.append(tuple(node))
+        return cls(parent, player, offset, np.array(payoffs, dtype=float),
+                   labels=labels, player_names=player_names)
+
+
+def backward_induction(tree):
+    """Subgame-perfect equilibrium by level-by-level backward induction.
+
+    Returns ``(values, choice)``: ``values[i]`` is the payoff vector reached
+    from node ``i`` under equilibrium play and ``choice[i]`` is the child
+    selected at decision node ``i`` (-1 at terminal nodes). Ties are broken
+    in favour of the first action.
+    """
+    n = tree.n_nodes
+    values = np.empty((n, tree.n_players), dtype=tree.payoffs.dtype)
+    leaves = np.flatnonzero(tree.payoff_offset >= 0)
+    values[leaves] = tree.payoffs[tree.payoff_offset[leaves]]
+    choice = np.full(n, -1, dtype=tree.parent.dtype)
+
+    ls = tree.level_start
+    for d in range(tree.depth - 1, -1, -1):
+        lo, hi = ls[d], ls[d + 1]
+        deciders = lo + np.flatnonzero(tree.payoff_offset[lo:hi] < 0)
+        if deciders.size == 0:
+            continue
+        # Children of level d are exactly level d + 1, grouped by parent.
+        kids = np.arange(ls[d + 1], ls[d + 2], dtype=tree.parent.dtype)
+        movers = tree.player[tree.parent[kids]]
+        key = values[kids, movers]
+        segments = tree.first_child[deciders] - ls[d + 1]
+
+        best = np.maximum.reduceat(key, segments)
+        is_best = key == np.repeat(best, tree.n_children[deciders])
+        picks = np.minimum.reduceat(np.where(is_best, kids, n), segments)
+
+        choice[deciders] = picks
+        values[deciders] = values[picks]
+    return values, choice
+
+
+def equilibrium_path(tree, choice):
+    """Nodes visited from the root when every player follows ``choice``."""
+    path = [0]
+    while choice[path[-1]] >= 0:
+        path.append(int(choice[path[-1]]))
+    return path
+
+
+def _strategy_layout(tree, max_profiles):
+    """Decision nodes and mixed-radix strides that enumerate pure strategies."""
+    decision = np.flatnonzero(tree.player >= 0)
+    stride = np.zeros(tree.n_nodes, dtype=np.int64)
+    shape = []
+    for k in range(tree.n_players):
+        nodes = decision[tree.player[decision] == k]
+        radices = tree.n_children[nodes].astype(np.int64)
+        stride[nodes] = np.concatenate([[1], np.cumprod(radices)[:-1]]) if nodes.size else []
+        shape.append(int(np.prod(radices, dtype=np.float64)) if nodes.size else 1)
+    if np.prod(shape, dtype=np.float64) > max_profiles:
+        raise ValueError(f"Normal form would have {' x '.join(map(str, shape))} strategy "
+                         f"profiles, more than the limit of {max_profiles}.")
+    return stride, shape
+
+
+def strategy_labels(tree, k, max_profiles=10**6):
+    """Readable names for player ``k``'s pure strategies (one action per decision node)."""
+    stride, shape = _strategy_layout(tree, max_profiles)
+    nodes = np.flatnonzero(tree.player == k)
+    names = []
+    for s in range(shape[k]):
+        actions = [tree.action_label(tree.first_child[v] + (s // stride[v]) % tree.n_children[v])
+                   for v in nodes]
+        names.append("/".join(actions) if actions else "-")
+    return names
+
+
+def to_normal_form(tree, max_profiles=10**6):
+    """Payoff arrays of the induced normal form, one per player.
+
+    A pure strategy picks one action at each of the player's decision nodes;
+    strategies are numbered in mixed radix with the shallowest node varying
+    fastest. All strategy profiles are played out simultaneously, one tree
+    level per step. For a two-player game the result is ``(p1_matrix,
+    p2_matrix)`` in the layout used by the Nash Equilibrium page.
+    """
+    stride, shape = _strategy_layout(tree, max_profiles)
+    profiles = np.indices(shape).reshape(len(shape), -1)
+
+    node = np.zeros(profiles.shape[1], dtype=np.int64)
+    for _ in range(tree.depth):
+        moving = np.flatnonzero(tree.player[node] >= 0)
+        if moving.size == 0:
+            break
+        at = node[moving]
+        own = profiles[tree.player[at], moving]
+        node[moving] = tree.first_child[at] + (own // stride[at]) % tree.n_children[at]
+
+    outcome = tree.payoffs[tree.payoff_offset[node]]
+    return tuple(outcome[:, k].reshape(shape) for k in range(tree.n_players))
+
+
+def full_tree_size(depth, branching):
+    """Number of nodes of a tree where every node above ``depth`` has ``branching`` children."""
+    return sum(branching ** d for d in range(depth + 1))
+
+
+def max_random_depth(branching):
+    """Deepest random tree with this branching that stays within ``MAX_RANDOM_NODES``."""
+    depth = 0
+    while full_tree_size(depth + 1, branching) <= MAX_RANDOM_NODES:
+        depth += 1
+    return depth
+
+
+def random_tree(depth, branching=2, n_players=2, leaf_probability=0.0, seed=None,
+                dtype=np.float32):
+    """Random perfect-information tree generated level by level.
+
+    Each decision node has between 1 and ``branching`` children (exactly
+    ``branching`` when ``leaf_probability`` is 0), nodes below the root
+    stop early with ``leaf_probability``, and players alternate by depth.
+    Trees that could exceed ``MAX_RANDOM_NODES`` nodes are refused.
+    """
+    if full_tree_size(depth, branching) > MAX_RANDOM_NODES:
+        raise ValueError(f"A tree of depth {depth} with branching {branching} may exceed "
+                         f"{MAX_RANDOM_NODES:,} nodes; use at most depth {max_random_depth(branching)}.")
+    rng = np.random.default_rng(seed)
+    parents = [np.array([-1], dtype=np.int64)]
+    level_size, start = 1, 0
+    for d in range(depth):
+        deciding = np.ones(level_size, dtype=bool)
+        if d > 0 and leaf_probability > 0:
+            deciding = rng.random(level_size) >= leaf_probability
+        if leaf_probability > 0:
+            counts = np.where(deciding, rng.integers(1, branching + 1, level_size), 0)
+        else:
+            counts = np.full(level_size, branching)
+        children = np.repeat(np.arange(start, start + level_size), counts)
+        if children.size == 0:
+            break
+        parents.append(children)
+        start += level_size
+        level_size = children.size
+
+    parent = np.concatenate(parents)
+    n = parent.size
+    idx = _index_dtype(n)
+    parent = parent.astype(idx)
+
+    n_children = np.bincount(parent[1:], minlength=n)
+    is_leaf = n_children == 0
+    payoff_offset = np.full(n, -1, dtype=idx)
+    payoff_offset[is_leaf] = np.arange(np.count_nonzero(is_leaf), dtype=idx)
+
+    depth_of = np.repeat(np.arange(len(parents)), [p.size for p in parents])
+    player = np.where(is_leaf, -1, depth_of % n_players).astype(np.int8)
+    payoffs = rng.random((np.count_nonzero(is_leaf), n_players), dtype=dtype)
+    return GameTree(parent, player, payoff_offset, payoffs)
+
+
+def sequential_prisoners_dilemma(R=3, S=0, T=5, P=1):
+    """Player 1 moves first; Player 2 observes the move and responds."""
+    return GameTree.from_nested(
+        (0, {"C": (1, {"C": (R, R), "D": (S, T)}),
+             "D": (1, {"C": (T, S), "D": (P, P)})}),
+    )
+
+
+def entry_deterrence(monopoly=4, duopoly=1, fight_cost=1):
+    """A potential entrant decides whether to enter; the incumbent may then fight."""
+    return GameTree.from_nested(
+        (0, {"Out": (0, monopoly),
+             "In": (1, {"Fight": (-fight_cost, -fight_cost),
+                        "Accommodate": (duopoly, duopoly)})}),
+        player_names=["Entrant", "Incumbent"],
+    )
+
+
+def centipede(rounds=6):
+    """Linear centipede: taking at round k pays the mover k + 2 and the other k."""
+    final = [0.0, 0.0]
+    last_mover = (rounds - 1) % 2
+    final[last_mover], final[1 - last_mover] = rounds, rounds + 2
+    node = tuple(final)
+    for k in range(rounds - 1, -1, -1):
+        mover = k % 2
+        take = [0.0, 0.0]
+        take[mover], take[1 - mover] = k + 2, k
+        node = (mover, {"Take": tuple(take), "Pass": node})
+    return GameTree.from_nested(node)
@@ -0,0 +1,13 @@
+"""Payoff templates shared by the demo pages."""
+
+import numpy as np
+
+
+# 2x2 bimatrix games as (Player 1 payoffs, Player 2 payoffs); rows are
+# Player 1's strategies and columns are Player 2's strategies.
+BIMATRIX_GAMES = {
+    "Matching Pennies": (np.array([[1, -1], [-1, 1]]), np.array([[-1, 1], [1, -1]])),
+    "Battle of the Sexes": (np.array([[2, 0], [0, 1]]), np.array([[1, 0], [0, 2]])),
+    "Chicken Game": (np.array([[0, -1], [1, -10]]), np.array([[0, 1], [-1, -10]])),
+    "Rock Paper Scissors (2x2)": (np.array([[0, -1], [1, 0]]), np.array([[0, 1], [-1, 0]])),
+}
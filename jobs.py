@@ -0,0 +1,377 @@
+"""Background job scheduler for long simulations.
+
+Simulations run in a pool of worker processes that is started once per
+server process and kept warm, so a long run no longer blocks the Streamlit
+script thread and survives the user navigating to another page. Pages submit
+a job, keep its id in ``st.session_state`` and poll for progress and result.
+
+- Jobs are deduplicated by a hash of their kind and parameters: submitting an
+  identical job attaches to the queued, running or finished one. A job shared
+  by several users is only cancelled once all of them have cancelled it.
+- Input files, such as uploaded edge lists, are handed over with the job and
+  belong to it alone; the scheduler deletes them once the job finishes, or at
+  once if the submission attached to an existing job.
+- Workers report progress and check for cancellation through a slot in shared
+  memory; cancellation is cooperative and takes effect at the next report.
+- Each user may run a limited number of jobs at once, and queued jobs are
+  dispatched round-robin across users so one user cannot starve the others.
+"""
+
+import hashlib
+import itertools
+import json
+import multiprocessing
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import numpy as np
+
+import backends
+
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class JobCancelled(Exception):
+    """Raised inside a worker when its job has been cancelled."""
+
+
+class QueueFull(RuntimeError):
+    """Raised when a user already has too many jobs waiting."""
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+
+_progress = None
+_cancel = None
+
+
+def _init_worker(progress, cancel):
+    global _progress, _cancel
+    _progress, _cancel = progress, cancel
+
+    # Jobs already run in their own process; do not nest process pools
+    backends.allow_multiprocess = False
+
+
+def _warm_up():
+    """Import the simulation modules and calibrate kernels so the first real job starts immediately."""
+    import evolutionary  # noqa: F401
+    import networks  # noqa: F401
+    backends.calibrate_all()
+    return os.getpid()
+
+
+class JobContext:
+    """Handle passed to job functions for progress reports and cancellation checks."""
+
+    def __init__(self, slot):
+        self.slot = slot
+
+    def report(self, fraction):
+        """Publish progress in [0, 1]; raises JobCancelled if the job was cancelled."""
+        _progress[self.slot] = fraction
+        if _cancel[self.slot]:
+            raise JobCancelled()
+
+
+# Long single-trajectory runs are split into this many chunks to report progress
+REPORT_CHUNKS = 50
+
+
+def _replicator_job(params, context):
+    payoff_matrix = np.array(params["payoff_matrix"])
+    num_generations = params["num_generations"]
+    chunk = math.ceil(num_generations / REPORT_CHUNKS)
+    freq_a, fitness_a, fitness_b, avg_fitness = [np.array([params["initial_freq_a"]])], [], [], []
+    for start in range(0, num_generations, chunk):
+        context.report(0.9 * start / num_generations)
+        freqs, fit_a, fit_b, avg = (result[0] for result in backends.run(
+            "replicator", payoff_matrix, freq_a[-1][-1:],
+            min(chunk, num_generations - start), params["selection_strength"]
+        ))
+        # Each chunk starts from the last frequency of the previous one
+        freq_a.append(freqs[1:])
+        fitness_a.append(fit_a)
+        fitness_b.append(fit_b)
+        avg_fitness.append(avg)
+    freq_a, fitness_a, fitness_b, avg_fitness = (
+        np.concatenate(parts) for parts in (freq_a, fitness_a, fitness_b, avg_fitness)
+    )
+    context.report(0.9)
+    p_values = np.linspace(0, 1, 21)
+    dp_dt = backends.run("direction_field", payoff_matrix, p_values, params["selection_strength"])
+    return {"freq_a": freq_a, "fitness_a": fitness_a, "fitness_b": fitness_b,
+            "avg_fitness": avg_fitness, "p_values": p_values, "dp_dt": dp_dt}
+
+
+def _network_job(params, context):
+    import networks
+
+    context.report(0.0)
+    if params["network_type"] == "Edge-list file":
+        # The upload is the job's own copy and is deleted when it finishes, so do not cache
+        graph = networks.load_edge_list(params["edge_path"], cache=False)
+    elif params["network_type"] == "Small-world":
+        graph = networks.small_world_graph(params["num_nodes"], params["mean_degree"],
+                                           params["rewire_probability"], seed=0)
+    else:
+        graph = networks.scale_free_graph(params["num_nodes"], params["mean_degree"],
+                                          params["exponent"], seed=0)
+
+    freq_a = networks.simulate_network_game(
+        graph, params["payoff_matrix"], params["initial_freq_a"], params["num_steps"],
+        params["update_rule"], params["selection_strength"], seed=0,
+        progress=context.report,
+    )
+    return {"freq_a": freq_a, "n_nodes": graph.n_nodes, "n_edges": graph.n_edges,
+            "nbytes": graph.nbytes, "degree_counts": np.bincount(graph.degree)}
+
+
+def _bimatrix_job(params, context):
+    import evolutionary
+
+    p1_matrix = np.array(params["p1_matrix"]) * params["selection_strength"]
+    p2_matrix = np.array(params["p2_matrix"]) * params["selection_strength"]
+    starts = np.linspace(0.05, 0.95, params["grid_size"])
+    x0, y0 = np.meshgrid(starts, starts)
+    trajectories, status, stop_step = evolutionary.bimatrix_replicator(
+        p1_matrix, p2_matrix, x0.ravel(), y0.ravel(), steps=params["num_steps"],
+        progress=context.report,
+    )
+    # Up to 1000 points per run are plenty for plotting, and keep finished results small
+    stride = max(params["num_steps"] // 1000, 1)
+    paths = [np.vstack([trajectories[:stop + 1:stride, run], trajectories[stop, run]])
+             for run, stop in enumerate(stop_step)]
+    return {"paths": paths, "status": status, "steps_computed": trajectories.shape[0] - 1}
+
+
+JOB_KINDS = {
+    "replicator": _replicator_job,
+    "bimatrix": _bimatrix_job,
+    "network": _network_job,
+}
+
+
+def _run_job(kind, params, slot):
+    return JOB_KINDS[kind](params, JobContext(slot))
+
+
+# ---------------------------------------------------------------------------
+# Scheduler side
+
+def job_key(kind, params):
+    """Hash identifying a job by its kind and parameters."""
+    payload = json.dumps([kind, params], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class Job:
+    """State of one submitted job as seen by the scheduler."""
+
+    def __init__(self, job_id, key, user, kind, params, files=None):
+        self.id = job_id
+        self.key = key
+        self.user = user
+        self.users = {user}  # every user attached to the job, the submitter included
+        self.kind = kind
+        self.params = params
+        self.files = files or {}
+        self.status = QUEUED
+        self.slot = None
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.finished_at = None
+        self._progress = 0.0
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED, CANCELLED)
+
+
+class JobScheduler:
+    """Per-process scheduler feeding a warm pool of worker processes."""
+
+    def __init__(self, max_workers=None, per_user_limit=1, max_queued_per_user=5, keep_finished=100):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.per_user_limit = per_user_limit
+        self.max_queued_per_user = max_queued_per_user
+        self.keep_finished = keep_finished
+
+        # Shared memory for the spawned workers (see backends.spawn_pool)
+        self._context = multiprocessing.get_context("spawn")
+        self._progress = self._context.Array("d", self.max_workers, lock=False)
+        self._cancel = self._context.Array("b", self.max_workers, lock=False)
+        self._start_pool()
+
+        self._lock = threading.RLock()
+        self._ids = itertools.count(1)
+        self._jobs = {}
+        self._by_key = {}
+        self._queues = OrderedDict()  # user -> deque of queued jobs, in round-robin order
+        self._running = {}            # user -> number of running jobs
+        self._free_slots = list(range(self.max_workers))
+
+    def _start_pool(self):
+        # All workers are started here; submitting jobs later never spawns a process
+        self._pool = backends.spawn_pool(self.max_workers, _init_worker, (self._progress, self._cancel))
+        for _ in range(self.max_workers):
+            self._pool.submit(_warm_up)
+
+    def submit(self, user, kind, params, files=None):
+        """Queue a job, or attach to an identical one; returns the job id.
+
+        ``files`` maps parameter names to input files the job takes ownership
+        of. They are passed to the job with its parameters but are not part
+        of its identity, and are deleted when the job finishes or if they are
+        not needed because the submission attached to an existing job.
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind '{kind}'.")
+        key = job_key(kind, params)
+        with self._lock:
+            existing = self._jobs.get(self._by_key.get(key))
+            if existing is not None and existing.status in (QUEUED, RUNNING, DONE):
+                existing.users.add(user)
+                _remove_files(files)
+                return existing.id
+
+            if user not in self._queues:
+                # A user who has never been served goes ahead of those who have
+                self._queues[user] = deque()
+                self._queues.move_to_end(user, last=False)
+            queue = self._queues[user]
+            if len(queue) >= self.max_queued_per_user:
+                _remove_files(files)
+                raise QueueFull(f"You already have {len(queue)} simulations waiting.")
+
+            job = Job(next(self._ids), key, user, kind, params, files)
+            self._jobs[job.id] = job
+            self._by_key[key] = job.id
+            queue.append(job)
+            self._dispatch()
+            return job.id
+
+    def get(self, job_id):
+        """The job with this id, with its progress refreshed, or None."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.status == RUNNING:
+                job._progress = self._progress[job.slot]
+            return job
+
+    def progress(self, job_id):
+        job = self.get(job_id)
+        if job is None:
+            return 0.0
+        return 1.0 if job.status == DONE else job._progress
+
+    def cancel(self, job_id, user):
+        """Detach ``user`` from a job, and cancel it if no other user is attached.
+
+        Cancelled queued jobs are dropped, running jobs stop at their next
+        progress report. Returns True if the job is being cancelled, False if
+        it keeps running for other users.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return False
+            job.users.discard(user)
+            if job.users:
+                return False
+            if job.status == QUEUED:
+                self._queues[job.user].remove(job)
+                self._finish(job, CANCELLED)
+            else:
+                self._cancel[job.slot] = 1
+            return True
+
+    def _dispatch(self):
+        """Start queued jobs, taking one per user in turn while slots are free."""
+        progressed = True
+        while self._free_slots and progressed:
+            progressed = False
+            for user in list(self._queues):
+                queue = self._queues[user]
+                if not queue or self._running.get(user, 0) >= self.per_user_limit:
+                    continue
+                if not self._free_slots:
+                    break
+                job = queue.popleft()
+                # Move this user to the back of the round-robin order
+                self._queues.move_to_end(user)
+                self._start(job)
+                progressed = True
+
+    def _start(self, job):
+        slot = self._free_slots.pop()
+        self._progress[slot] = 0.0
+        self._cancel[slot] = 0
+        job.slot = slot
+        job.status = RUNNING
+        self._running[job.user] = self._running.get(job.user, 0) + 1
+        pool = self._pool
+        future = pool.submit(_run_job, job.kind, {**job.params, **job.files}, slot)
+        future.add_done_callback(lambda f, job=job: self._on_done(job, f, pool))
+
+    def _on_done(self, job, future, future_pool):
+        with self._lock:
+            self._running[job.user] -= 1
+            self._free_slots.append(job.slot)
+            error = future.exception()
+            if error is None:
+                job.result = future.result()
+                self._finish(job, DONE)
+            elif isinstance(error, JobCancelled):
+                self._finish(job, CANCELLED)
+            else:
+                job.error = f"{type(error).__name__}: {error}"
+                self._finish(job, FAILED)
+                if isinstance(error, BrokenProcessPool) and self._pool is future_pool:
+                    # A worker died (e.g. out of memory); replace the pool for later jobs
+                    self._start_pool()
+            self._dispatch()
+
+    def _finish(self, job, status):
+        job.status = status
+        job.finished_at = time.time()
+        _remove_files(job.files)
+        if status != DONE and self._by_key.get(job.key) == job.id:
+            del self._by_key[job.key]
+
+        # Forget the oldest finished jobs beyond the retention limit
+        finished = sorted((j for j in self._jobs.values() if j.finished), key=lambda j: j.finished_at)
+        for old in finished[:max(len(finished) - self.keep_finished, 0)]:
+            del self._jobs[old.id]
+            if self._by_key.get(old.key) == old.id:
+                del self._by_key[old.key]
+
+
+def _remove_files(files):
+    for path in (files or {}).values():
+        Path(path).unlink(missing_ok=True)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """The scheduler of this server process, started on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = JobScheduler()
+        return _scheduler
@@ -0,0 +1,240 @@
+"""Normal-form games with three or more players.
+
+Two representations are supported:
+
+- ``NormalFormGame`` keeps one payoff tensor per player in a single array of
+  shape ``(n_players, s_1, ..., s_n)``; entry ``[k, a_1, ..., a_n]`` is
+  player ``k``'s payoff in profile ``(a_1, ..., a_n)``. The array may be a
+  read-only memory map (see ``load_game``), and pure equilibria are found
+  block by block so the tensor never has to fit in memory.
+- ``SymmetricGame`` is for games where every player has the same strategies
+  and payoffs depend only on a player's own strategy and on how many of the
+  others play each strategy. Payoffs are stored by those counts, so a game
+  with 100 players and two strategies needs 200 numbers instead of 2^100
+  per player, and its equilibria are found without expanding the tensor.
+
+A profile is a pure Nash equilibrium when every player's payoff is the
+maximum along that player's own axis; the best-response mask of each player
+is computed with one reduction and the masks are intersected.
+"""
+
+import math
+
+import numpy as np
+
+from surfaces import simplex_grid
+
+
+# Largest number of profiles handled at once when scanning a payoff tensor
+_BLOCK_CELLS = 1 << 22
+
+
+class NormalFormGame:
+    """Finite game with explicit payoff tensors for every player."""
+
+    def __init__(self, payoffs, player_names=None, strategy_names=None):
+        self.payoffs = payoffs if isinstance(payoffs, np.ndarray) else np.asarray(payoffs, dtype=float)
+        if self.payoffs.ndim != self.payoffs.shape[0] + 1:
+            raise ValueError("Payoffs must have shape (n_players, s_1, ..., s_n).")
+        self.player_names = (list(player_names) if player_names is not None
+                             else [f"Player {k + 1}" for k in range(self.n_players)])
+        self.strategy_names = strategy_names
+
+    @property
+    def n_players(self):
+        return self.payoffs.shape[0]
+
+    @property
+    def shape(self):
+        """Number of strategies of each player."""
+        return self.payoffs.shape[1:]
+
+    @property
+    def n_profiles(self):
+        return math.prod(self.shape)
+
+    @property
+    def nbytes(self):
+        return self.payoffs.nbytes
+
+    def best_response_mask(self, k, out=None, block_cells=_BLOCK_CELLS):
+        """Boolean tensor, True where player ``k`` is playing a best response.
+
+        The tensor is scanned in blocks of at most ``block_cells`` profiles
+        along the other players' axes. With ``out`` the mask is combined
+        into ``out`` with a logical and instead of being allocated.
+        """
+        if out is None:
+            out = np.ones(self.shape, dtype=bool)
+        # Move player k's axis last: each block then holds complete best-response comparisons
+        payoffs = np.moveaxis(self.payoffs[k], k, -1)
+        mask = np.moveaxis(out, k, -1)
+
+        # Block over as many leading axes as needed to keep blocks small
+        lead = 0
+        while lead < payoffs.ndim - 1 and math.prod(payoffs.shape[lead:]) > block_cells:
+            lead += 1
+        for index in np.ndindex(*payoffs.shape[:lead]):
+            block = np.asarray(payoffs[index])
+            mask[index] &= block >= block.max(axis=-1, keepdims=True)
+        return out
+
+    def pure_nash(self, block_cells=_BLOCK_CELLS):
+        """All pure Nash equilibria as an array of profiles, shape (equilibria, n_players)."""
+        mask = np.ones(self.shape, dtype=bool)
+        for k in range(self.n_players):
+            self.best_response_mask(k, mask, block_cells)
+        return np.argwhere(mask)
+
+    def profile_payoffs(self, profile):
+        """Payoff of every player in one pure profile."""
+        return np.asarray(self.payoffs[(slice(None),) + tuple(profile)], dtype=float)
+
+
+def load_game(path, **kwargs):
+    """Open a game saved with ``np.save`` (or ``SymmetricGame.to_tensor``) as a memory map."""
+    return NormalFormGame(np.load(path, mmap_mode="r"), **kwargs)
+
+
+def _count_keys(counts, total):
+    """Integer key of each row of strategy counts summing to ``total``."""
+    return counts @ (total + 1) ** np.arange(counts.shape[-1])
+
+
+class SymmetricGame:
+    """Symmetric game stored by strategy counts.
+
+    ``payoffs[a, c]`` is the payoff of a player using strategy ``a`` when
+    the other ``n_players - 1`` players are spread over the strategies as in
+    row ``c`` of ``others``, i.e. ``simplex_grid(n_strategies, n_players - 1)``.
+    """
+
+    def __init__(self, n_players, payoffs, strategy_names=None):
+        self.n_players = n_players
+        self.payoffs = np.asarray(payoffs, dtype=float)
+        self.n_strategies = self.payoffs.shape[0]
+        self.others = simplex_grid(self.n_strategies, n_players - 1)
+        if self.payoffs.shape != (self.n_strategies, len(self.others)):
+            raise ValueError(f"Payoffs must have shape ({self.n_strategies}, {len(self.others)}).")
+        self.strategy_names = (list(strategy_names) if strategy_names is not None
+                               else [f"Strategy {chr(65 + a)}" for a in range(self.n_strategies)])
+
+        keys = _count_keys(self.others, n_players - 1)
+        self._order = np.argsort(keys)
+        self._keys = keys[self._order]
+
+    @classmethod
+    def from_function(cls, n_players, n_strategies, payoff, strategy_names=None):
+        """Build a game from ``payoff(a, counts)``, vectorized over rows of other-player counts."""
+        others = simplex_grid(n_strategies, n_players - 1)
+        table = np.stack([np.broadcast_to(payoff(a, others), len(others)) for a in range(n_strategies)])
+        return cls(n_players, table, strategy_names)
+
+    @property
+    def nbytes(self):
+        return self.payoffs.nbytes
+
+    def _others_index(self, counts):
+        return self._order[np.searchsorted(self._keys, _count_keys(counts, self.n_players - 1))]
+
+    def payoff(self, a, counts):
+        """Payoff of strategy ``a`` against other-player ``counts`` (one row or many)."""
+        return self.payoffs[a, self._others_index(np.asarray(counts))]
+
+    def pure_nash(self):
+        """Pure equilibria as strategy counts of all players, shape (equilibria, n_strategies).
+
+        Every equilibrium stands for all profiles that assign these counts to
+        the players; see ``profile_count``.
+        """
+        best = self.payoffs >= self.payoffs.max(axis=0)
+        counts = simplex_grid(self.n_strategies, self.n_players)
+        stable = np.ones(len(counts), dtype=bool)
+        for a in range(self.n_strategies):
+            # Players using a see the others as the counts minus themselves
+            used = counts[:, a] > 0
+            others = counts[used]
+            others[:, a] -= 1
+            stable[used] &= best[a, self._others_index(others)]
+        return counts[stable]
+
+    def profile_count(self, counts):
+        """Number of pure profiles with the given strategy counts."""
+        return math.factorial(self.n_players) // math.prod(math.factorial(int(c)) for c in counts)
+
+    def count_payoffs(self, counts):
+        """Payoff of a player of each strategy when all players are spread as in ``counts``.
+
+        Strategies nobody uses get NaN.
+        """
+        counts = np.asarray(counts)
+        result = np.full(self.n_strategies, np.nan)
+        for a in np.flatnonzero(counts):
+            others = counts.copy()
+            others[a] -= 1
+            result[a] = self.payoff(a, others)
+        return result
+
+    def to_tensor(self, path=None, block_cells=_BLOCK_CELLS):
+        """Expand into a ``NormalFormGame``, written to a memory-mapped ``.npy`` file if ``path`` is given."""
+        n, s = self.n_players, self.n_strategies
+        shape = (n,) + (s,) * n
+        if path is not None:
+            tensor = np.lib.format.open_memmap(path, mode="w+", dtype=self.payoffs.dtype, shape=shape)
+        else:
+            tensor = np.empty(shape, dtype=self.payoffs.dtype)
+
+        flat = tensor.reshape(n, -1)
+        total = s ** n
+        for start in range(0, total, max(block_cells // n, 1)):
+            stop = min(start + max(block_cells // n, 1), total)
+            profiles = np.stack(np.unravel_index(np.arange(start, stop), (s,) * n), axis=1)
+            counts = np.stack([np.count_nonzero(profiles == a, axis=1) for a in range(s)], axis=1)
+            for k in range(n):
+                own = profiles[:, k]
+                others = counts.copy()
+                others[np.arange(len(own)), own] -= 1
+                flat[k, start:stop] = self.payoffs[own, self._others_index(others)]
+
+        if path is not None:
+            tensor.flush()
+            return load_game(path, strategy_names=self.strategy_names)
+        return NormalFormGame(tensor, strategy_names=self.strategy_names)
+
+
+def public_goods_game(n_players, multiplier=2.0, contribution=1.0):
+    """Each contribution is multiplied and shared equally among all players.
+
+    Contributing is dominated whenever the multiplier is below the number of
+    players, so everybody free-riding is the only equilibrium.
+    """
+    def payoff(a, others):
+        contributors = others[:, 0] + (a == 0)
+        return multiplier * contribution * contributors / n_players - contribution * (a == 0)
+    return SymmetricGame.from_function(n_players, 2, payoff, ["Contribute", "Free ride"])
+
+
+def volunteers_dilemma(n_players, benefit=1.0, cost=0.5):
+    """Everybody gains ``benefit`` if at least one player volunteers at a ``cost``.
+
+    The pure equilibria are the profiles with exactly one volunteer.
+    """
+    def payoff(a, others):
+        if a == 0:
+            return np.full(len(others), benefit - cost)
+        return np.where(others[:, 0] > 0, benefit, 0.0)
+    return SymmetricGame.from_function(n_players, 2, payoff, ["Volunteer", "Ignore"])
+
+
+def el_farol_game(n_players, capacity, crowding_cost=1.0):
+    """El Farol bar: going is worth 1 while attendance stays within ``capacity``.
+
+    Beyond capacity every extra guest costs those who went ``crowding_cost``;
+    staying home is worth 0.
+    """
+    def payoff(a, others):
+        if a == 1:
+            return np.zeros(len(others))
+        attendance = others[:, 0] + 1
+        return np.where(attendance <= capacity, 1.0, -crowding_cost * (attendance - capacity))
+    return SymmetricGame.from_function(n_players, 2, payoff, ["Go", "Stay home"])
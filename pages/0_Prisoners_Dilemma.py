@@ -3,6 +3,7 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from utils import show_code
+import atlas
 
 
 def prisoners_dilemma():
@@ -51,31 +52,15 @@ def prisoners_dilemma():
     # Nash equilibrium analysis
     st.write("### Nash Equilibrium Analysis")
     
-    # Check for Nash equilibria
+    # Every integer game on this page is in the precomputed atlas
+    analysis, source = atlas.analyze(payoff_matrix_p1, payoff_matrix_p2, "symmetric", 0, 10)
+    
     nash_equilibria = []
     strategies = [("Cooperate", "Cooperate"), ("Cooperate", "Defect"), 
                  ("Defect", "Cooperate"), ("Defect", "Defect")]
     
-    for i, (s1, s2) in enumerate(strategies):
-        row, col = i // 2, i % 2
-        
-        # Check if this is a Nash equilibrium
-        is_nash = True
-        
-        # Check Player 1's best response
-        current_payoff_p1 = payoff_matrix_p1[row, col]
-        alternative_payoff_p1 = payoff_matrix_p1[1-row, col]
-        if alternative_payoff_p1 > current_payoff_p1:
-            is_nash = False
-        
-        # Check Player 2's best response
-        current_payoff_p2 = payoff_matrix_p2[row, col]
-        alternative_payoff_p2 = payoff_matrix_p2[row, 1-col]
-        if alternative_payoff_p2 > current_payoff_p2:
-            is_nash = False
-        
-        if is_nash:
-            nash_equilibria.append((s1, s2))
+    for row, col in analysis["pure_equilibria"]:
+        nash_equilibria.append(strategies[row * 2 + col])
     
     if nash_equilibria:
         st.write("**Nash Equilibria found:**")
@@ -84,6 +69,20 @@ def prisoners_dilemma():
     else:
         st.write("No pure strategy Nash equilibria found.")
     
+    if analysis["mixed_equilibrium"] is not None:
+        p_cooperate = analysis["mixed_equilibrium"][0]
+        st.write(f"**Mixed equilibrium:** each player cooperates with probability {p_cooperate:.3f}")
+    
+    dominance = analysis["p1_dominance"].replace("Strategy A", "Cooperate").replace("Strategy B", "Defect")
+    ess = analysis["ess"].replace("Strategy A", "Cooperate").replace("Strategy B", "Defect")
+    st.write(f"**Dominance:** {dominance}")
+    st.write(f"**Evolutionary stability:** {ess}")
+    
+    if source == "atlas":
+        st.caption("Answered from the precomputed equilibrium atlas.")
+    else:
+        st.caption("Computed live (no equilibrium atlas found; build one with `python atlas.py symmetric`).")
+    
     # Interactive game simulation
     st.write("### Play the Game")
     
@@ -2,6 +2,10 @@ import streamlit as st
 import numpy as np
 import pandas as pd
 from utils import show_code
+import backends
+from n_player import el_farol_game, public_goods_game, volunteers_dilemma
+from correlated import OBJECTIVES, correlated_equilibrium
+from games import BIMATRIX_GAMES
 
 
 def nash_equilibrium_finder():
@@ -15,21 +19,26 @@ def nash_equilibrium_finder():
     # Input section for payoff matrices
     st.write("### Enter Payoff Matrices")
     
+    # Games sent from other pages (e.g. the normal form of a sequential game)
+    p1_default, p2_default = st.session_state.get(
+        "nash_game", ([[3, 0], [5, 1]], [[3, 5], [0, 1]])
+    )
+    
     col1, col2 = st.columns(2)
     
     with col1:
         st.write("**Player 1 Payoffs**")
-        p1_tl = st.number_input("Top-Left", value=3, key="p1_tl")
-        p1_tr = st.number_input("Top-Right", value=0, key="p1_tr")
-        p1_bl = st.number_input("Bottom-Left", value=5, key="p1_bl")
-        p1_br = st.number_input("Bottom-Right", value=1, key="p1_br")
+        p1_tl = st.number_input("Top-Left", value=p1_default[0][0], key="p1_tl")
+        p1_tr = st.number_input("Top-Right", value=p1_default[0][1], key="p1_tr")
+        p1_bl = st.number_input("Bottom-Left", value=p1_default[1][0], key="p1_bl")
+        p1_br = st.number_input("Bottom-Right", value=p1_default[1][1], key="p1_br")
     
     with col2:
         st.write("**Player 2 Payoffs**")
-        p2_tl = st.number_input("Top-Left", value=3, key="p2_tl")
-        p2_tr = st.number_input("Top-Right", value=5, key="p2_tr")
-        p2_bl = st.number_input("Bottom-Left", value=0, key="p2_bl")
-        p2_br = st.number_input("Bottom-Right", value=1, key="p2_br")
+        p2_tl = st.number_input("Top-Left", value=p2_default[0][0], key="p2_tl")
+        p2_tr = st.number_input("Top-Right", value=p2_default[0][1], key="p2_tr")
+        p2_bl = st.number_input("Bottom-Left", value=p2_default[1][0], key="p2_bl")
+        p2_br = st.number_input("Bottom-Right", value=p2_default[1][1], key="p2_br")
     
     # Create matrices
     payoff_p1 = np.array([[p1_tl, p1_tr], [p1_bl, p1_br]])
@@ -56,25 +65,11 @@ def nash_equilibrium_finder():
     strategy_names = [("Strategy A", "Strategy A"), ("Strategy A", "Strategy B"), 
                       ("Strategy B", "Strategy A"), ("Strategy B", "Strategy B")]
     
-    # Check each strategy combination
-    for i in range(2):
-        for j in range(2):
-            is_nash = True
-            
-            # Check Player 1's best response
-            current_p1 = payoff_p1[i, j]
-            alternative_p1 = payoff_p1[1-i, j]
-            
-            # Check Player 2's best response
-            current_p2 = payoff_p2[i, j]
-            alternative_p2 = payoff_p2[i, 1-j]
-            
-            # Is this a Nash equilibrium?
-            p1_satisfied = current_p1 >= alternative_p1
-            p2_satisfied = current_p2 >= alternative_p2
-            
-            if p1_satisfied and p2_satisfied:
-                nash_equilibria.append((strategy_names[i*2 + j], current_p1, current_p2))
+    # Check each strategy combination: both players must be playing a best response
+    is_nash = backends.run("pure_nash", payoff_p1[None], payoff_p2[None])[0]
+    
+    for i, j in zip(*np.nonzero(is_nash)):
+        nash_equilibria.append((strategy_names[i*2 + j], payoff_p1[i, j], payoff_p2[i, j]))
     
     if nash_equilibria:
         st.success(f"Found {len(nash_equilibria)} pure strategy Nash equilibrium/equilibria:")
@@ -162,16 +157,177 @@ def nash_equilibrium_finder():
             st.write("vs Player 1's Strategy B: Strategy B")
         else:
             st.write("vs Player 1's Strategy B: Indifferent")
+    
+    # Correlated equilibrium with the highest total payoff
+    st.write("### Correlated Equilibrium")
+    st.write("Distribution over strategy pairs that maximizes the total payoff while following a mediator's recommendation stays a best response for both players.")
+    
+    distribution, info = correlated_equilibrium(payoff_p1, payoff_p2)
+    st.dataframe(pd.DataFrame(
+        distribution.round(3),
+        columns=["Player 2: Strategy A", "Player 2: Strategy B"],
+        index=["Player 1: Strategy A", "Player 1: Strategy B"]
+    ))
+    st.write(f"Expected payoffs: Player 1 {(distribution * payoff_p1).sum():.3f}, "
+             f"Player 2 {(distribution * payoff_p2).sum():.3f}")
+
+
+def correlated_equilibrium_finder():
+    st.subheader("Correlated Equilibrium Finder")
+    
+    st.write("""
+    A correlated equilibrium is a distribution over strategy pairs from which a mediator privately
+    recommends each player a strategy, such that nobody gains by ignoring the recommendation. They
+    are found by linear programming; in an N×M game every pair of strategies of a player gives one
+    incentive constraint, so only the constraints and strategy pairs that matter are added to the
+    problem as the solver goes. That is fast for the random games below, even at 300×300, whose best
+    equilibria use few strategy pairs. Games close to zero-sum need most pairs and get too large
+    beyond about 40×40; they are stopped with an error after 30 seconds.
+    """)
+    
+    # Game selection
+    st.write("### Select Game")
+    
+    game_type = st.selectbox("Choose a game:", ["Random Game"] + list(BIMATRIX_GAMES))
+    
+    if game_type == "Random Game":
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            n_rows = st.slider("Player 1 strategies", 2, 300, 100)
+        with col2:
+            n_cols = st.slider("Player 2 strategies", 2, 300, 100)
+        with col3:
+            seed = st.number_input("Random seed", value=0, step=1)
+        rng = np.random.default_rng(int(seed))
+        payoff_p1 = rng.integers(-10, 11, size=(n_rows, n_cols)).astype(float)
+        payoff_p2 = rng.integers(-10, 11, size=(n_rows, n_cols)).astype(float)
+        st.write("Payoffs are integers drawn uniformly from -10 to 10.")
+    else:
+        payoff_p1, payoff_p2 = BIMATRIX_GAMES[game_type]
+    
+    objective = st.selectbox("Objective:", OBJECTIVES)
+    
+    if st.button("Find Correlated Equilibrium"):
+        try:
+            distribution, info = correlated_equilibrium(payoff_p1, payoff_p2, objective)
+        except RuntimeError as error:
+            st.error(str(error))
+            return
+        
+        st.write("### Correlated Equilibrium")
+        col1, col2 = st.columns(2)
+        col1.metric("Player 1 payoff", f"{(distribution * payoff_p1).sum():.3f}")
+        col2.metric("Player 2 payoff", f"{(distribution * payoff_p2).sum():.3f}")
+        
+        rows, cols = np.nonzero(distribution > 1e-9)
+        order = np.argsort(-distribution[rows, cols])
+        support = pd.DataFrame({
+            "Player 1 strategy": rows[order] + 1,
+            "Player 2 strategy": cols[order] + 1,
+            "Probability": distribution[rows, cols][order],
+            "Player 1 payoff": payoff_p1[rows, cols][order],
+            "Player 2 payoff": payoff_p2[rows, cols][order],
+        })
+        st.write(f"The distribution recommends {len(support)} strategy pair(s):")
+        st.dataframe(support)
+        
+        st.write("### Solver Statistics")
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Constraint build", f"{info['build_time']:.3f} s")
+        col2.metric("LP solve", f"{info['solve_time']:.3f} s")
+        col3.metric("Pricing", f"{info['pricing_time']:.3f} s")
+        col4.metric("Rounds", info["rounds"])
+        st.write(f"The last LP had {info['variables']:,} of {distribution.size:,} strategy pairs and "
+                 f"{info['constraints']:,} of {info['full_constraints']:,} incentive constraints.")
+
+
+def n_player_nash_finder():
+    st.subheader("N-Player Game Nash Equilibrium Finder")
+    
+    st.write("""
+    With three or more players the payoffs form a tensor with one axis per player. In the
+    symmetric games below a player's payoff only depends on their own choice and on how many
+    others make each choice, so equilibria are found from those counts without building the
+    full tensor.
+    """)
+    
+    # Game selection
+    st.write("### Select Game")
+    
+    game_type = st.selectbox(
+        "Choose a game:",
+        ["Public Goods Game", "Volunteer's Dilemma", "El Farol Bar"]
+    )
+    
+    n_players = st.slider("Number of players", 3, 200, 10)
+    
+    if game_type == "Public Goods Game":
+        multiplier = st.slider("Multiplication factor", 1.0, 10.0, 2.0, 0.5)
+        game = public_goods_game(n_players, multiplier)
+        st.write("Contributions cost 1 and are multiplied and shared equally among all players.")
+    elif game_type == "Volunteer's Dilemma":
+        col1, col2 = st.columns(2)
+        with col1:
+            benefit = st.number_input("Benefit if someone volunteers", value=1.0)
+        with col2:
+            cost = st.number_input("Cost of volunteering", value=0.5)
+        game = volunteers_dilemma(n_players, benefit, cost)
+    else:  # El Farol Bar
+        capacity = st.slider("Bar capacity", 1, n_players, max(n_players * 6 // 10, 1))
+        game = el_farol_game(n_players, capacity)
+        st.write("Going is worth 1 while the bar is not overcrowded; each guest beyond capacity costs everybody who went 1.")
+    
+    # Nash equilibria by strategy counts
+    st.write("### Nash Equilibrium Analysis")
+    
+    equilibria = game.pure_nash()
+    
+    if len(equilibria):
+        rows = []
+        for counts in equilibria:
+            payoffs = game.count_payoffs(counts)
+            row = {name: int(c) for name, c in zip(game.strategy_names, counts)}
+            row.update({f"Payoff ({name})": payoffs[a] for a, name in enumerate(game.strategy_names) if counts[a]})
+            row["Pure profiles"] = f"{game.profile_count(counts):,}"
+            rows.append(row)
+        st.success(f"Found {len(equilibria)} equilibrium strategy count(s):")
+        st.dataframe(pd.DataFrame(rows))
+    else:
+        st.warning("No pure strategy Nash equilibria found.")
+    
+    full_size = n_players * game.n_strategies ** n_players * 8
+    st.write(f"Compact payoff table: {game.nbytes:,} bytes. "
+             f"Full payoff tensor ({n_players} × {game.n_strategies}^{n_players} entries): {full_size:.3g} bytes.")
+    
+    # Cross-check against the full tensor for small games
+    if n_players <= 16 and st.checkbox("Check against the full payoff tensor"):
+        tensor_game = game.to_tensor()
+        profiles = tensor_game.pure_nash()
+        st.write(f"The full tensor has {tensor_game.n_profiles:,} profiles and "
+                 f"{len(profiles):,} pure Nash equilibria.")
+        expected = sum(game.profile_count(counts) for counts in equilibria)
+        if len(profiles) == expected:
+            st.success("✅ Both representations find the same equilibria.")
+        else:
+            st.error(f"Expected {expected:,} equilibrium profiles.")
 
 
 st.set_page_config(page_title="Nash Equilibrium", page_icon="🎯")
 st.markdown("# Nash Equilibrium Calculator 🎯")
 st.sidebar.header("Nash Equilibrium")
 st.write("""
-Find Nash equilibria in 2x2 games. A Nash equilibrium occurs when each player's 
+Find Nash equilibria in 2x2 games and in games with many players, and correlated equilibria of two-player games. A Nash equilibrium occurs when each player's 
 strategy is a best response to the other player's strategy.
 """)
 
-nash_equilibrium_finder()
+number_of_players = st.sidebar.radio("Number of players", ["Two players", "Two players, correlated", "Three or more players"])
 
-show_code(nash_equilibrium_finder)
\ No newline at end of file
+if number_of_players == "Two players":
+    nash_equilibrium_finder()
+    show_code(nash_equilibrium_finder)
+elif number_of_players == "Two players, correlated":
+    correlated_equilibrium_finder()
+    show_code(correlated_equilibrium_finder)
+else:
+    n_player_nash_finder()
+    show_code(n_player_nash_finder)
\ No newline at end of file
@@ -3,6 +3,10 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from utils import show_code
+from games import BIMATRIX_GAMES
+from qre import qre_path
+from surfaces import payoff_surfaces
+from correlated import OBJECTIVES, correlated_equilibrium
 
 
 def mixed_strategy_calculator():
@@ -19,21 +23,11 @@ def mixed_strategy_calculator():
     # Quick game templates
     game_template = st.selectbox(
         "Choose a template or customize:",
-        ["Custom", "Matching Pennies", "Battle of the Sexes", "Chicken Game", "Rock Paper Scissors (2x2)"]
+        ["Custom"] + list(BIMATRIX_GAMES)
     )
     
-    if game_template == "Matching Pennies":
-        p1_matrix = np.array([[1, -1], [-1, 1]])
-        p2_matrix = np.array([[-1, 1], [1, -1]])
-    elif game_template == "Battle of the Sexes":
-        p1_matrix = np.array([[2, 0], [0, 1]])
-        p2_matrix = np.array([[1, 0], [0, 2]])
-    elif game_template == "Chicken Game":
-        p1_matrix = np.array([[0, -1], [1, -10]])
-        p2_matrix = np.array([[0, 1], [-1, -10]])
-    elif game_template == "Rock Paper Scissors (2x2)":
-        p1_matrix = np.array([[0, -1], [1, 0]])
-        p2_matrix = np.array([[0, 1], [-1, 0]])
+    if game_template in BIMATRIX_GAMES:
+        p1_matrix, p2_matrix = BIMATRIX_GAMES[game_template]
     else:  # Custom
         col1, col2 = st.columns(2)
         
@@ -155,31 +149,40 @@ def mixed_strategy_calculator():
     with col2:
         p2_strategy_prob = st.slider("Player 2: Probability of Strategy A", 0.0, 1.0, 0.5, 0.01)
     
-    # Calculate expected payoffs for these probabilities
-    expected_p1_interactive = (p1_strategy_prob * p2_strategy_prob * p1_matrix[0,0] + 
-                              p1_strategy_prob * (1-p2_strategy_prob) * p1_matrix[0,1] + 
-                              (1-p1_strategy_prob) * p2_strategy_prob * p1_matrix[1,0] + 
-                              (1-p1_strategy_prob) * (1-p2_strategy_prob) * p1_matrix[1,1])
-    
-    expected_p2_interactive = (p1_strategy_prob * p2_strategy_prob * p2_matrix[0,0] + 
-                              p1_strategy_prob * (1-p2_strategy_prob) * p2_matrix[0,1] + 
-                              (1-p1_strategy_prob) * p2_strategy_prob * p2_matrix[1,0] + 
-                              (1-p1_strategy_prob) * (1-p2_strategy_prob) * p2_matrix[1,1])
+    # Payoffs over the whole strategy grid are computed once per game; sliders only index into them
+    surfaces = payoff_surfaces(p1_matrix, p2_matrix)
+    p1_strategy = [p1_strategy_prob, 1 - p1_strategy_prob]
+    p2_strategy = [p2_strategy_prob, 1 - p2_strategy_prob]
+    expected_p1_interactive, expected_p2_interactive = surfaces.expected_payoffs(p1_strategy, p2_strategy)
     
     st.write("**Expected Payoffs with Current Probabilities:**")
     st.write(f"Player 1: {expected_p1_interactive:.3f}")
     st.write(f"Player 2: {expected_p2_interactive:.3f}")
     
+    # Heatmaps of both payoff surfaces with the best-response correspondences overlaid
+    br1_p2, br1_p1 = surfaces.best_response_path(1)
+    br2_p2, br2_p1 = surfaces.best_response_path(2)
+    
+    fig, axes = plt.subplots(1, 2, figsize=(12, 5))
+    for ax, payoffs, player in zip(axes, [surfaces.payoffs_1, surfaces.payoffs_2], ["Player 1", "Player 2"]):
+        image = ax.imshow(payoffs, origin='lower', extent=(0, 1, 0, 1), aspect='auto', cmap='viridis')
+        fig.colorbar(image, ax=ax, label='Expected payoff')
+        ax.plot(br1_p2, br1_p1, 'w-', linewidth=3, clip_on=False, label="Player 1's best response")
+        ax.plot(br2_p2, br2_p1, 'r--', linewidth=2, clip_on=False, label="Player 2's best response")
+        ax.plot(p2_strategy_prob, p1_strategy_prob, 'k*', markersize=12, label='Current strategies')
+        ax.set_xlabel('Player 2: Probability of Strategy A')
+        ax.set_ylabel('Player 1: Probability of Strategy A')
+        ax.set_title(f"{player}'s Expected Payoff")
+    axes[0].legend(loc='upper left', fontsize='small')
+    plt.tight_layout()
+    st.pyplot(fig)
+    st.caption("Nash equilibria lie where the two best-response correspondences cross.")
+    
     # Best response given opponent's strategy
     st.write("### Best Response Analysis")
     
-    # Player 1's best response to Player 2's mixed strategy
-    p1_payoff_a = p2_strategy_prob * p1_matrix[0,0] + (1-p2_strategy_prob) * p1_matrix[0,1]
-    p1_payoff_b = p2_strategy_prob * p1_matrix[1,0] + (1-p2_strategy_prob) * p1_matrix[1,1]
-    
-    # Player 2's best response to Player 1's mixed strategy
-    p2_payoff_a = p1_strategy_prob * p2_matrix[0,0] + (1-p1_strategy_prob) * p2_matrix[1,0]
-    p2_payoff_b = p1_strategy_prob * p2_matrix[0,1] + (1-p1_strategy_prob) * p2_matrix[1,1]
+    # Payoff of each pure strategy against the opponent's mixed strategy
+    (p1_payoff_a, p1_payoff_b), (p2_payoff_a, p2_payoff_b) = surfaces.pure_payoffs(p1_strategy, p2_strategy)
     
     col1, col2 = st.columns(2)
     
@@ -206,6 +209,80 @@ def mixed_strategy_calculator():
         else:
             st.write("Indifferent between strategies")
             st.write(f"Expected payoff: {p2_payoff_a:.3f}")
+    
+    # Bounded rationality: logit quantal response equilibrium
+    st.write("### Quantal Response Equilibrium")
+    st.write("""
+    Real players make mistakes: in a logit quantal response equilibrium (QRE) each player
+    picks a strategy with probability proportional to exp(λ × expected payoff). At λ = 0 play
+    is completely random; as λ grows, play approaches a Nash equilibrium.
+    """)
+    
+    rationality = st.slider("Rationality (λ)", 0.0, 20.0, 2.0, 0.1)
+    
+    # The equilibrium path is traced once per game; slider moves interpolate along it
+    path = qre_path(p1_matrix, p2_matrix).extend(20.0)
+    qre_p1, qre_p2 = path.at(rationality)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.write("**Player 1's QRE Strategy:**")
+        st.write(f"Play Strategy A with probability: {qre_p1[0]:.3f}")
+    
+    with col2:
+        st.write("**Player 2's QRE Strategy:**")
+        st.write(f"Play Strategy A with probability: {qre_p2[0]:.3f}")
+    
+    path_lambdas, path_p1, path_p2 = path.curve()
+    shown = path_lambdas <= 20.0
+    
+    fig, ax = plt.subplots(figsize=(10, 4))
+    ax.plot(path_lambdas[shown], path_p1[shown, 0], 'b-', linewidth=2, label='Player 1: P(Strategy A)')
+    ax.plot(path_lambdas[shown], path_p2[shown, 0], 'r-', linewidth=2, label='Player 2: P(Strategy A)')
+    ax.axvline(x=rationality, color='k', linestyle=':', alpha=0.7)
+    ax.set_xlabel('Rationality (λ)')
+    ax.set_ylabel('Probability')
+    ax.set_title('Logit QRE Path')
+    ax.set_ylim(0, 1)
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    st.pyplot(fig)
+    
+    # Correlated equilibrium: a mediator draws a strategy pair and privately recommends each part
+    st.write("### Correlated Equilibrium")
+    st.write("""
+    A mediator (think of a traffic light) draws a strategy pair from a public distribution and tells
+    each player only their own part. The distribution is a correlated equilibrium when following the
+    recommendation is always a best response. In Chicken, a light that recommends (Strategy A, Strategy A)
+    most of the time and one of the asymmetric outcomes otherwise gives both players more than the mixed
+    equilibrium, and never recommends a crash.
+    """)
+    
+    ce_objective = st.selectbox(
+        "Correlated equilibrium objective:",
+        OBJECTIVES + ["Maximize P(Strategy A, Strategy A)"]
+    )
+    if ce_objective in OBJECTIVES:
+        weights = ce_objective
+    else:
+        weights = np.array([[1.0, 0.0], [0.0, 0.0]])
+    
+    distribution, info = correlated_equilibrium(p1_matrix, p2_matrix, weights)
+    st.dataframe(pd.DataFrame(
+        distribution.round(3),
+        columns=["Player 2: Strategy A", "Player 2: Strategy B"],
+        index=["Player 1: Strategy A", "Player 1: Strategy B"]
+    ))
+    
+    col1, col2 = st.columns(2)
+    col1.metric("Player 1 payoff", f"{(distribution * p1_matrix).sum():.3f}")
+    col2.metric("Player 2 payoff", f"{(distribution * p2_matrix).sum():.3f}")
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Constraint build", f"{info['build_time'] * 1000:.1f} ms")
+    col2.metric("LP solve", f"{info['solve_time'] * 1000:.1f} ms")
+    col3.metric("Pricing", f"{info['pricing_time'] * 1000:.1f} ms")
 
 
 st.set_page_config(page_title="Mixed Strategy", page_icon="🎲")
@@ -1,18 +1,18 @@
+import shutil
+import tempfile
+
 import streamlit as st
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from utils import show_code
+from utils import follow_job, show_code, submit_job
+from games import BIMATRIX_GAMES
+from evolutionary import CONVERGED, CYCLING, bimatrix_field, mixed_equilibrium
+from jobs import QueueFull
+from networks import UPDATE_RULES
 
 
-def evolutionary_game_simulation():
-    st.subheader("Evolutionary Game Theory Simulation")
-    
-    st.write("""
-    Simulate population dynamics in evolutionary games. Watch how strategy frequencies 
-    evolve over time based on relative fitness (payoffs).
-    """)
-    
+def select_payoff_matrix():
     # Game selection
     st.write("### Select Game Type")
     
@@ -70,6 +70,19 @@ def evolutionary_game_simulation():
     )
     st.dataframe(payoff_df)
     
+    return payoff_matrix
+
+
+def evolutionary_game_simulation():
+    st.subheader("Evolutionary Game Theory Simulation")
+    
+    st.write("""
+    Simulate population dynamics in evolutionary games. Watch how strategy frequencies 
+    evolve over time based on relative fitness (payoffs).
+    """)
+    
+    payoff_matrix = select_payoff_matrix()
+    
     # Simulation parameters
     st.write("### Simulation Parameters")
     
@@ -84,162 +97,395 @@ def evolutionary_game_simulation():
     with col3:
         selection_strength = st.slider("Selection strength", 0.1, 2.0, 1.0, 0.1)
     
-    # Run simulation
+    # Run simulation in the background; the page polls until the result is ready
+    params = {
+        "payoff_matrix": payoff_matrix.tolist(),
+        "initial_freq_a": initial_freq_a,
+        "num_generations": num_generations,
+        "selection_strength": selection_strength,
+    }
     if st.button("Run Simulation"):
-        
-        # Initialize
-        freq_a = np.zeros(num_generations + 1)
-        freq_a[0] = initial_freq_a
-        
-        avg_fitness_a = np.zeros(num_generations)
-        avg_fitness_b = np.zeros(num_generations)
-        avg_fitness_pop = np.zeros(num_generations)
-        
-        # Replicator dynamics simulation
-        for t in range(num_generations):
-            p = freq_a[t]  # Frequency of strategy A
-            q = 1 - p      # Frequency of strategy B
+        try:
+            submit_job("evolution_job", "replicator", params)
+        except QueueFull as error:
+            st.error(str(error))
+    
+    result = follow_job("evolution_job", "replicator", params)
+    if result is None:
+        return
+    
+    # Replicator dynamics: p <- p + 0.01 * selection_strength * p * (fitness_a - avg_fitness)
+    freq_a = result["freq_a"]
+    avg_fitness_a, avg_fitness_b, avg_fitness_pop = result["fitness_a"], result["fitness_b"], result["avg_fitness"]
+    
+    # Results
+    st.write("### Simulation Results")
+    
+    # Final frequencies
+    final_freq_a = freq_a[-1]
+    final_freq_b = 1 - final_freq_a
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.metric("Final frequency of Strategy A", f"{final_freq_a:.3f}")
+    
+    with col2:
+        st.metric("Final frequency of Strategy B", f"{final_freq_b:.3f}")
+    
+    # Plot evolution
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8))
+    
+    # Frequency evolution
+    generations = np.arange(num_generations + 1)
+    ax1.plot(generations, freq_a, 'b-', linewidth=2, label='Strategy A')
+    ax1.plot(generations, 1 - freq_a, 'r-', linewidth=2, label='Strategy B')
+    ax1.set_xlabel('Generation')
+    ax1.set_ylabel('Frequency')
+    ax1.set_title('Evolution of Strategy Frequencies')
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+    ax1.set_ylim(0, 1)
+    
+    # Fitness evolution
+    generations_fitness = np.arange(num_generations)
+    ax2.plot(generations_fitness, avg_fitness_a, 'b--', label='Fitness A')
+    ax2.plot(generations_fitness, avg_fitness_b, 'r--', label='Fitness B')
+    ax2.plot(generations_fitness, avg_fitness_pop, 'g-', linewidth=2, label='Population Average')
+    ax2.set_xlabel('Generation')
+    ax2.set_ylabel('Fitness')
+    ax2.set_title('Evolution of Fitness')
+    ax2.legend()
+    ax2.grid(True, alpha=0.3)
+    
+    plt.tight_layout()
+    st.pyplot(fig)
+    
+    # Equilibrium analysis
+    st.write("### Equilibrium Analysis")
+    
+    # Calculate evolutionary stable strategy (ESS)
+    try:
+        # For a mixed ESS, we need: fitness_a = fitness_b when both are present
+        # p * a11 + (1-p) * a12 = p * a21 + (1-p) * a22
+        # Solving for p:
+        denominator = (payoff_matrix[0,0] - payoff_matrix[0,1]) - (payoff_matrix[1,0] - payoff_matrix[1,1])
+        
+        if abs(denominator) > 1e-10:
+            ess_freq = (payoff_matrix[1,1] - payoff_matrix[0,1]) / denominator
             
-            # Calculate fitness (expected payoffs)
-            fitness_a = p * payoff_matrix[0, 0] + q * payoff_matrix[0, 1]
-            fitness_b = p * payoff_matrix[1, 0] + q * payoff_matrix[1, 1]
-            avg_fitness = p * fitness_a + q * fitness_b
+            if 0 < ess_freq < 1:
+                st.success(f"Mixed Evolutionary Stable Strategy found!")
+                st.write(f"ESS frequency of Strategy A: {ess_freq:.3f}")
+                st.write(f"ESS frequency of Strategy B: {1-ess_freq:.3f}")
+                
+                # Check if simulation converged to ESS
+                if abs(final_freq_a - ess_freq) < 0.05:
+                    st.success("✅ Simulation converged to the ESS!")
+                else:
+                    st.warning("⚠️ Simulation did not converge to the theoretical ESS.")
             
-            # Store fitness values
-            avg_fitness_a[t] = fitness_a
-            avg_fitness_b[t] = fitness_b
-            avg_fitness_pop[t] = avg_fitness
+            elif ess_freq <= 0:
+                st.info("Strategy B is evolutionarily stable (dominates)")
+                if final_freq_a < 0.05:
+                    st.success("✅ Simulation converged: Strategy A eliminated")
             
-            # Replicator equation: dp/dt = p * (fitness_a - avg_fitness) * selection_strength
-            if avg_fitness != 0:
-                delta_p = p * (fitness_a - avg_fitness) * selection_strength * 0.01
-                freq_a[t + 1] = max(0, min(1, p + delta_p))
-            else:
-                freq_a[t + 1] = p
-        
-        # Results
-        st.write("### Simulation Results")
-        
-        # Final frequencies
-        final_freq_a = freq_a[-1]
-        final_freq_b = 1 - final_freq_a
+            elif ess_freq >= 1:
+                st.info("Strategy A is evolutionarily stable (dominates)")
+                if final_freq_a > 0.95:
+                    st.success("✅ Simulation converged: Strategy B eliminated")
         
+        else:
+            st.info("Neutral evolution - fitness difference is constant")
+    
+    except:
+        st.warning("Could not determine theoretical ESS")
+    
+    # Phase portrait (simplified)
+    st.write("### Direction Field")
+    
+    p_values, dp_dt_values = result["p_values"], result["dp_dt"]
+    
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.plot(p_values, dp_dt_values, 'b-', linewidth=2)
+    ax.axhline(y=0, color='k', linestyle='--', alpha=0.5)
+    ax.set_xlabel('Frequency of Strategy A')
+    ax.set_ylabel('Change in frequency (dp/dt)')
+    ax.set_title('Evolutionary Dynamics - Direction Field')
+    ax.grid(True, alpha=0.3)
+    
+    # Mark equilibria
+    zero_crossings = []
+    for i in range(len(dp_dt_values)-1):
+        if dp_dt_values[i] * dp_dt_values[i+1] < 0:
+            zero_crossings.append(p_values[i])
+    
+    for crossing in zero_crossings:
+        ax.axvline(x=crossing, color='r', linestyle=':', alpha=0.7, label=f'Equilibrium at p={crossing:.2f}')
+    
+    if zero_crossings:
+        ax.legend()
+    
+    st.pyplot(fig)
+
+
+def two_population_simulation():
+    st.subheader("Two-Population Replicator Dynamics")
+    
+    st.write("""
+    In an asymmetric game the two players come from different populations, such as
+    buyers and sellers. Each population evolves according to its own payoffs, so the
+    state is a pair (x, y): the share of population 1 and of population 2 playing Strategy A.
+    """)
+    
+    # Game selection
+    st.write("### Select Game")
+    
+    game_template = st.selectbox(
+        "Choose a game:",
+        list(BIMATRIX_GAMES) + ["Custom"]
+    )
+    
+    if game_template in BIMATRIX_GAMES:
+        p1_matrix, p2_matrix = BIMATRIX_GAMES[game_template]
+    else:  # Custom
         col1, col2 = st.columns(2)
         
         with col1:
-            st.metric("Final frequency of Strategy A", f"{final_freq_a:.3f}")
+            st.write("**Population 1 Payoffs**")
+            p1_11 = st.number_input("(Strategy A, Strategy A)", value=3.0, key="p1_11")
+            p1_12 = st.number_input("(Strategy A, Strategy B)", value=0.0, key="p1_12")
+            p1_21 = st.number_input("(Strategy B, Strategy A)", value=1.0, key="p1_21")
+            p1_22 = st.number_input("(Strategy B, Strategy B)", value=2.0, key="p1_22")
+            p1_matrix = np.array([[p1_11, p1_12], [p1_21, p1_22]])
         
         with col2:
-            st.metric("Final frequency of Strategy B", f"{final_freq_b:.3f}")
-        
-        # Plot evolution
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8))
-        
-        # Frequency evolution
-        generations = np.arange(num_generations + 1)
-        ax1.plot(generations, freq_a, 'b-', linewidth=2, label='Strategy A')
-        ax1.plot(generations, 1 - freq_a, 'r-', linewidth=2, label='Strategy B')
-        ax1.set_xlabel('Generation')
-        ax1.set_ylabel('Frequency')
-        ax1.set_title('Evolution of Strategy Frequencies')
-        ax1.legend()
-        ax1.grid(True, alpha=0.3)
-        ax1.set_ylim(0, 1)
-        
-        # Fitness evolution
-        generations_fitness = np.arange(num_generations)
-        ax2.plot(generations_fitness, avg_fitness_a, 'b--', label='Fitness A')
-        ax2.plot(generations_fitness, avg_fitness_b, 'r--', label='Fitness B')
-        ax2.plot(generations_fitness, avg_fitness_pop, 'g-', linewidth=2, label='Population Average')
-        ax2.set_xlabel('Generation')
-        ax2.set_ylabel('Fitness')
-        ax2.set_title('Evolution of Fitness')
-        ax2.legend()
-        ax2.grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        st.pyplot(fig)
+            st.write("**Population 2 Payoffs**")
+            p2_11 = st.number_input("(Strategy A, Strategy A)", value=0.0, key="p2_11")
+            p2_12 = st.number_input("(Strategy A, Strategy B)", value=2.0, key="p2_12")
+            p2_21 = st.number_input("(Strategy B, Strategy A)", value=1.0, key="p2_21")
+            p2_22 = st.number_input("(Strategy B, Strategy B)", value=0.0, key="p2_22")
+            p2_matrix = np.array([[p2_11, p2_12], [p2_21, p2_22]])
+    
+    game_display = pd.DataFrame(
+        [
+            [f"({p1_matrix[0,0]:.1f}, {p2_matrix[0,0]:.1f})", f"({p1_matrix[0,1]:.1f}, {p2_matrix[0,1]:.1f})"],
+            [f"({p1_matrix[1,0]:.1f}, {p2_matrix[1,0]:.1f})", f"({p1_matrix[1,1]:.1f}, {p2_matrix[1,1]:.1f})"]
+        ],
+        columns=["Population 2: Strategy A", "Population 2: Strategy B"],
+        index=["Population 1: Strategy A", "Population 1: Strategy B"]
+    )
+    st.dataframe(game_display)
+    
+    # Simulation parameters
+    st.write("### Simulation Parameters")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        grid_size = st.slider("Starting points per axis", 2, 20, 6)
+    
+    with col2:
+        num_steps = st.slider("Maximum number of steps", 100, 10000, 3000, 100)
+    
+    with col3:
+        selection_strength = st.slider("Selection strength", 0.1, 2.0, 1.0, 0.1, key="two_pop_selection")
+    
+    # All starting points are evolved together as one batch in the background
+    params = {
+        "p1_matrix": p1_matrix.tolist(),
+        "p2_matrix": p2_matrix.tolist(),
+        "grid_size": grid_size,
+        "num_steps": num_steps,
+        "selection_strength": selection_strength,
+    }
+    if st.button("Run Simulation", key="two_pop_run"):
+        try:
+            submit_job("two_pop_job", "bimatrix", params)
+        except QueueFull as error:
+            st.error(str(error))
+    
+    result = follow_job("two_pop_job", "bimatrix", params)
+    if result is not None:
+        paths, status = result["paths"], result["status"]
         
-        # Equilibrium analysis
-        st.write("### Equilibrium Analysis")
+        st.write("### Simulation Results")
         
-        # Calculate evolutionary stable strategy (ESS)
-        try:
-            # For a mixed ESS, we need: fitness_a = fitness_b when both are present
-            # p * a11 + (1-p) * a12 = p * a21 + (1-p) * a22
-            # Solving for p:
-            denominator = (payoff_matrix[0,0] - payoff_matrix[0,1]) - (payoff_matrix[1,0] - payoff_matrix[1,1])
-            
-            if abs(denominator) > 1e-10:
-                ess_freq = (payoff_matrix[1,1] - payoff_matrix[0,1]) / denominator
-                
-                if 0 < ess_freq < 1:
-                    st.success(f"Mixed Evolutionary Stable Strategy found!")
-                    st.write(f"ESS frequency of Strategy A: {ess_freq:.3f}")
-                    st.write(f"ESS frequency of Strategy B: {1-ess_freq:.3f}")
-                    
-                    # Check if simulation converged to ESS
-                    if abs(final_freq_a - ess_freq) < 0.05:
-                        st.success("✅ Simulation converged to the ESS!")
-                    else:
-                        st.warning("⚠️ Simulation did not converge to the theoretical ESS.")
-                
-                elif ess_freq <= 0:
-                    st.info("Strategy B is evolutionarily stable (dominates)")
-                    if final_freq_a < 0.05:
-                        st.success("✅ Simulation converged: Strategy A eliminated")
-                
-                elif ess_freq >= 1:
-                    st.info("Strategy A is evolutionarily stable (dominates)")
-                    if final_freq_a > 0.95:
-                        st.success("✅ Simulation converged: Strategy B eliminated")
-            
-            else:
-                st.info("Neutral evolution - fitness difference is constant")
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Converged runs", int(np.sum(status == CONVERGED)))
+        col2.metric("Closed orbits", int(np.sum(status == CYCLING)))
+        col3.metric("Steps computed", result["steps_computed"])
         
-        except:
-            st.warning("Could not determine theoretical ESS")
+        fig, ax = plt.subplots(figsize=(8, 8))
         
-        # Phase portrait (simplified)
-        st.write("### Direction Field")
+        # Direction field
+        grid = np.linspace(0, 1, 15)
+        gx, gy = np.meshgrid(grid, grid)
+        dx, dy = bimatrix_field(p1_matrix, p2_matrix, gx, gy)
+        ax.quiver(gx, gy, dx, dy, color='gray', alpha=0.5)
         
-        p_values = np.linspace(0, 1, 21)
-        dp_dt_values = []
+        # Trajectories, each drawn up to the step where it stopped
+        for run, path in enumerate(paths):
+            color = 'purple' if status[run] == CYCLING else 'b'
+            ax.plot(path[:, 0], path[:, 1], color=color, linewidth=1, alpha=0.7)
+            ax.plot(path[0, 0], path[0, 1], 'o', color=color, markersize=3)
         
-        for p in p_values:
-            q = 1 - p
-            fitness_a = p * payoff_matrix[0, 0] + q * payoff_matrix[0, 1]
-            fitness_b = p * payoff_matrix[1, 0] + q * payoff_matrix[1, 1]
-            avg_fitness = p * fitness_a + q * fitness_b
-            
-            if p > 0 and p < 1:
-                dp_dt = p * (fitness_a - avg_fitness) * selection_strength
-            else:
-                dp_dt = 0
-            
-            dp_dt_values.append(dp_dt)
-        
-        fig, ax = plt.subplots(figsize=(10, 6))
-        ax.plot(p_values, dp_dt_values, 'b-', linewidth=2)
-        ax.axhline(y=0, color='k', linestyle='--', alpha=0.5)
-        ax.set_xlabel('Frequency of Strategy A')
-        ax.set_ylabel('Change in frequency (dp/dt)')
-        ax.set_title('Evolutionary Dynamics - Direction Field')
+        equilibrium = mixed_equilibrium(p1_matrix, p2_matrix)
+        if equilibrium is not None:
+            ax.plot(*equilibrium, 'r*', markersize=15, label='Mixed Nash equilibrium')
+            ax.legend()
+        
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.set_aspect('equal')
+        ax.set_xlabel('Population 1: frequency of Strategy A (x)')
+        ax.set_ylabel('Population 2: frequency of Strategy A (y)')
+        ax.set_title('Two-Population Replicator Dynamics')
         ax.grid(True, alpha=0.3)
         
-        # Mark equilibria
-        zero_crossings = []
-        for i in range(len(dp_dt_values)-1):
-            if dp_dt_values[i] * dp_dt_values[i+1] < 0:
-                zero_crossings.append(p_values[i])
+        st.pyplot(fig)
         
-        for crossing in zero_crossings:
-            ax.axvline(x=crossing, color='r', linestyle=':', alpha=0.7, label=f'Equilibrium at p={crossing:.2f}')
+        # Equilibrium analysis
+        st.write("### Equilibrium Analysis")
         
-        if zero_crossings:
-            ax.legend()
+        if equilibrium is not None:
+            st.write(f"Mixed Nash equilibrium: x = {equilibrium[0]:.3f}, y = {equilibrium[1]:.3f}")
+            if np.any(status == CYCLING):
+                st.info("Trajectories form closed orbits around the mixed equilibrium: "
+                        "it is neutrally stable, and the populations keep cycling.")
+            else:
+                st.info("In two-population dynamics an interior equilibrium is never asymptotically "
+                        "stable; trajectories move towards the pure strategy corners.")
+        else:
+            st.write("No interior mixed equilibrium: the dynamics end in pure strategy states.")
+
+
+def network_simulation():
+    st.subheader("Evolutionary Games on Networks")
+    
+    st.write("""
+    In a structured population each individual only plays against its neighbours in an
+    interaction network, and copies strategies from those neighbours. Clusters of
+    cooperators can then survive where they would die out in a well-mixed population.
+    """)
+    
+    payoff_matrix = select_payoff_matrix()
+    
+    # Network selection
+    st.write("### Interaction Network")
+    
+    network_type = st.selectbox(
+        "Network type:",
+        ["Scale-free", "Small-world", "Edge-list file"]
+    )
+    
+    if network_type == "Edge-list file":
+        uploaded = st.file_uploader("Edge list (two node ids per line separated by spaces or a comma, '#' for comments)",
+                                    type=["txt", "csv", "edges"])
+        if uploaded is None:
+            st.info("Upload an edge list to continue.")
+            return
+    else:
+        col1, col2, col3 = st.columns(3)
         
-        st.pyplot(fig)
+        with col1:
+            num_nodes = st.select_slider("Number of nodes", [1_000, 10_000, 100_000, 1_000_000], 10_000)
+        
+        with col2:
+            mean_degree = st.slider("Mean degree", 2, 20, 4, 2)
+        
+        with col3:
+            if network_type == "Small-world":
+                rewire_probability = st.slider("Rewiring probability", 0.0, 1.0, 0.1, 0.01)
+            else:
+                exponent = st.slider("Degree exponent", 2.1, 3.5, 2.5, 0.1)
+    
+    # Simulation parameters
+    st.write("### Simulation Parameters")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        update_rule = st.selectbox("Update rule", UPDATE_RULES)
+        initial_freq_a = st.slider("Initial frequency of Strategy A", 0.0, 1.0, 0.5, 0.01, key="network_initial")
+    
+    with col2:
+        num_steps = st.slider("Number of steps", 10, 500, 100, key="network_steps")
+        selection_strength = st.slider("Selection strength", 0.1, 2.0, 1.0, 0.1, key="network_selection")
+    
+    params = {
+        "network_type": network_type,
+        "payoff_matrix": payoff_matrix.tolist(),
+        "initial_freq_a": initial_freq_a,
+        "num_steps": num_steps,
+        "update_rule": update_rule,
+        "selection_strength": selection_strength,
+    }
+    if network_type == "Edge-list file":
+        params["upload"] = uploaded.file_id
+    elif network_type == "Small-world":
+        params.update(num_nodes=num_nodes, mean_degree=mean_degree, rewire_probability=rewire_probability)
+    else:
+        params.update(num_nodes=num_nodes, mean_degree=mean_degree, exponent=exponent)
+    
+    if st.button("Run Simulation", key="network_run"):
+        files = None
+        if network_type == "Edge-list file":
+            # Stream the upload to a file of the job's own; the scheduler deletes it when done
+            uploaded.seek(0)
+            with tempfile.NamedTemporaryFile("wb", prefix="edges_", suffix=".txt", delete=False) as f:
+                shutil.copyfileobj(uploaded, f)
+            files = {"edge_path": f.name}
+        try:
+            submit_job("network_job", "network", params, files)
+        except QueueFull as error:
+            st.error(str(error))
+    
+    result = follow_job("network_job", "network", params)
+    if result is None:
+        return
+    
+    freq_a = result["freq_a"]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Nodes", f"{result['n_nodes']:,}")
+    col2.metric("Edges", f"{result['n_edges']:,}")
+    col3.metric("Mean degree", f"{2 * result['n_edges'] / result['n_nodes']:.2f}")
+    col4.metric("Network memory", f"{result['nbytes'] / 1e6:.1f} MB")
+    
+    # Results
+    st.write("### Simulation Results")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.metric("Final frequency of Strategy A", f"{freq_a[-1]:.3f}")
+    
+    with col2:
+        st.metric("Final frequency of Strategy B", f"{1 - freq_a[-1]:.3f}")
+    
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8))
+    
+    steps = np.arange(num_steps + 1)
+    ax1.plot(steps, freq_a, 'b-', linewidth=2, label='Strategy A')
+    ax1.plot(steps, 1 - freq_a, 'r-', linewidth=2, label='Strategy B')
+    ax1.set_xlabel('Step')
+    ax1.set_ylabel('Frequency')
+    ax1.set_title(f'Evolution of Strategy Frequencies ({update_rule})')
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+    ax1.set_ylim(0, 1)
+    
+    # Degree distribution on log-log axes
+    degree_counts = result["degree_counts"]
+    degrees = np.flatnonzero(degree_counts)
+    ax2.loglog(degrees, degree_counts[degrees] / result["n_nodes"], 'ko', markersize=3)
+    ax2.set_xlabel('Degree')
+    ax2.set_ylabel('Fraction of nodes')
+    ax2.set_title('Degree Distribution')
+    ax2.grid(True, alpha=0.3)
+    
+    plt.tight_layout()
+    st.pyplot(fig)
 
 
 st.set_page_config(page_title="Evolutionary Games", page_icon="🧬")
@@ -250,6 +496,16 @@ Simulate how strategies evolve in populations over time. In evolutionary game th
 strategies that perform better (have higher fitness) become more common in the population.
 """)
 
-evolutionary_game_simulation()
+population_model = st.sidebar.radio(
+    "Population model", ["Single population", "Two populations (asymmetric)", "Network"]
+)
 
-show_code(evolutionary_game_simulation)
\ No newline at end of file
+if population_model == "Single population":
+    evolutionary_game_simulation()
+    show_code(evolutionary_game_simulation)
+elif population_model == "Network":
+    network_simulation()
+    show_code(network_simulation)
+else:
+    two_population_simulation()
+    show_code(two_population_simulation)
\ No newline at end of file
@@ -0,0 +1,155 @@
+import time
+
+import streamlit as st
+import pandas as pd
+from utils import show_code
+import backends
+from extensive_form import (
+    backward_induction, centipede, entry_deterrence, equilibrium_path, max_random_depth, random_tree,
+    sequential_prisoners_dilemma, strategy_labels, to_normal_form,
+)
+
+
+@st.cache_resource(max_entries=2, show_spinner="Building and solving the tree...")
+def solved_random_tree(depth, branching, leaf_probability):
+    """Random tree with its backward-induction solution and timings, shared by all sessions.
+
+    Large trees take seconds and hundreds of MB, so they are only built again
+    when one of the tree sliders changes.
+    """
+    start = time.perf_counter()
+    tree = random_tree(depth, branching, leaf_probability=leaf_probability, seed=0)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    values, choice = backward_induction(tree)
+    solve_time = time.perf_counter() - start
+    return tree, build_time, values, choice, solve_time
+
+
+def extensive_form_solver():
+    st.subheader("Sequential Games and Backward Induction")
+
+    st.write("""
+    In a sequential game players move one after another and can see earlier moves.
+    Backward induction solves the game from the last decision upwards and yields the
+    subgame-perfect equilibrium (SPE).
+    """)
+
+    # Game selection
+    st.write("### Select Game")
+
+    game_type = st.selectbox(
+        "Choose a game:",
+        ["Sequential Prisoner's Dilemma", "Entry Deterrence", "Centipede Game", "Random Large Tree"]
+    )
+
+    if game_type == "Sequential Prisoner's Dilemma":
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            R = st.number_input("Reward (R)", value=3)
+        with col2:
+            S = st.number_input("Sucker (S)", value=0)
+        with col3:
+            T = st.number_input("Temptation (T)", value=5)
+        with col4:
+            P = st.number_input("Punishment (P)", value=1)
+        tree = sequential_prisoners_dilemma(R, S, T, P)
+
+    elif game_type == "Entry Deterrence":
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            monopoly = st.number_input("Monopoly profit", value=4)
+        with col2:
+            duopoly = st.number_input("Duopoly profit", value=1)
+        with col3:
+            fight_cost = st.number_input("Cost of a price war", value=1)
+        tree = entry_deterrence(monopoly, duopoly, fight_cost)
+
+    elif game_type == "Centipede Game":
+        rounds = st.slider("Number of rounds", 2, 12, 6)
+        tree = centipede(rounds)
+
+    else:  # Random Large Tree
+        col1, col2, col3 = st.columns(3)
+        with col2:
+            branching = st.slider("Maximum branching", 2, 6, 2)
+        with col1:
+            # Deeper trees are only offered while they fit in MAX_RANDOM_NODES
+            max_depth = max_random_depth(branching)
+            depth = st.slider("Depth", 2, max_depth, min(16, max_depth))
+        with col3:
+            leaf_probability = st.slider("Early-stop probability", 0.0, 0.5, 0.0, 0.05)
+
+        tree, build_time, values, choice, solve_time = solved_random_tree(depth, branching, leaf_probability)
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Nodes", f"{tree.n_nodes:,}")
+        col2.metric("Tree memory", f"{tree.nbytes / 1e6:.1f} MB")
+        col3.metric("Build time", f"{build_time:.2f} s")
+
+    # Backward induction
+    st.write("### Subgame-Perfect Equilibrium")
+
+    if game_type != "Random Large Tree":
+        start = time.perf_counter()
+        values, choice = backward_induction(tree)
+        solve_time = time.perf_counter() - start
+
+    path = equilibrium_path(tree, choice)
+    st.write(f"Solved {tree.n_nodes:,} nodes in {solve_time * 1000:.1f} ms.")
+
+    if tree.labels is not None:
+        moves = [f"{tree.player_names[tree.player[parent]]}: {tree.action_label(node)}"
+                 for parent, node in zip(path[:-1], path[1:])]
+        st.success("Equilibrium path: " + " → ".join(moves))
+    else:
+        st.success(f"Equilibrium path reaches a terminal node after {len(path) - 1} moves.")
+
+    for k, name in enumerate(tree.player_names):
+        st.write(f"{name} equilibrium payoff: {values[0, k]:.3f}")
+
+    if game_type == "Random Large Tree":
+        return
+
+    # Normal form
+    st.write("### Induced Normal Form")
+    st.write("""
+    A pure strategy specifies an action at every decision node of a player, including
+    nodes that are never reached. Every Nash equilibrium of this table is shown, but
+    only the SPE survives backward induction.
+    """)
+
+    p1_matrix, p2_matrix = to_normal_form(tree)
+    rows = strategy_labels(tree, 0)
+    cols = strategy_labels(tree, 1)
+
+    # A cell is a pure Nash equilibrium when each payoff is a best response
+    is_nash = backends.run("pure_nash", p1_matrix[None], p2_matrix[None])[0]
+
+    game_display = pd.DataFrame(
+        [[f"({p1_matrix[i, j]:g}, {p2_matrix[i, j]:g})" + (" ★" if is_nash[i, j] else "")
+          for j in range(len(cols))] for i in range(len(rows))],
+        columns=[f"{tree.player_names[1]}: {c}" for c in cols],
+        index=[f"{tree.player_names[0]}: {r}" for r in rows]
+    )
+    st.dataframe(game_display)
+    st.caption("★ marks pure strategy Nash equilibria of the normal form.")
+
+    if p1_matrix.shape == (2, 2):
+        if st.button("Send to Nash Equilibrium page"):
+            st.session_state["nash_game"] = (p1_matrix.tolist(), p2_matrix.tolist())
+            st.success("Normal form loaded. Open the Nash Equilibrium page from the sidebar.")
+
+
+st.set_page_config(page_title="Extensive Form Games", page_icon="🌳")
+st.markdown("# Extensive Form Games 🌳")
+st.sidebar.header("Extensive Form Games")
+st.write("""
+Solve sequential games by backward induction and compare the subgame-perfect
+equilibrium with the Nash equilibria of the equivalent normal-form game.
+""")
+
+extensive_form_solver()
+
+show_code(extensive_form_solver)
@@ -0,0 +1,192 @@
+"""Logit quantal response equilibrium (QRE) for bimatrix games.
+
+In a logit QRE each player chooses strategies with probabilities
+proportional to ``exp(lambda * expected payoff)``. At ``lambda = 0`` play is
+uniformly random; as ``lambda`` grows the equilibrium moves towards a Nash
+equilibrium. The solutions form a smooth curve starting at the centroid,
+which is traced by pseudo-arclength predictor-corrector continuation in
+log-probabilities.
+
+Traced curves are cached per game and extended on demand, so evaluating the
+QRE at a new ``lambda`` is an interpolation along the stored curve plus a
+short Newton polish rather than a new solve. A cached path is shared by all
+sessions, so extending it is guarded by a lock.
+"""
+
+import threading
+
+import numpy as np
+
+from caching import LRUCache, array_key
+
+
+# Number of games whose QRE paths are kept in memory
+PATH_CACHE_SIZE = 32
+
+_paths = LRUCache(PATH_CACHE_SIZE)
+
+
+def _split(u, n):
+    """Probabilities (x, y) from the log-probability vector u."""
+    return np.exp(u[:n]), np.exp(u[n:])
+
+
+def _residual(A, B, u, lam):
+    """QRE conditions H(u, lambda) for u = (log x, log y)."""
+    n, m = A.shape
+    x, y = _split(u, n)
+    a, b = u[:n], u[n:]
+    payoff_1 = A @ y
+    payoff_2 = B.T @ x
+    return np.concatenate([
+        (a[1:] - a[0]) - lam * (payoff_1[1:] - payoff_1[0]), [x.sum() - 1],
+        (b[1:] - b[0]) - lam * (payoff_2[1:] - payoff_2[0]), [y.sum() - 1],
+    ])
+
+
+def _jacobian(A, B, u, lam):
+    """Jacobian of H with respect to (u, lambda), shape (n + m, n + m + 1)."""
+    n, m = A.shape
+    x, y = _split(u, n)
+    J = np.zeros((n + m, n + m + 1))
+
+    # Player 1's logit conditions
+    J[:n - 1, 0] = -1
+    J[np.arange(n - 1), np.arange(1, n)] = 1
+    J[:n - 1, n:n + m] = -lam * (A[1:] - A[0]) * y
+    J[:n - 1, -1] = -((A[1:] - A[0]) @ y)
+    J[n - 1, :n] = x
+
+    # Player 2's logit conditions
+    rows = slice(n, n + m - 1)
+    J[rows, n] = -1
+    J[np.arange(n, n + m - 1), np.arange(n + 1, n + m)] = 1
+    J[rows, :n] = -lam * (B[:, 1:] - B[:, :1]).T * x
+    J[rows, -1] = -((B[:, 1:] - B[:, :1]).T @ x)
+    J[n + m - 1, n:n + m] = y
+    return J
+
+
+def _tangent(J, previous=None):
+    """Unit tangent of the solution curve, oriented along ``previous``."""
+    q, _ = np.linalg.qr(J.T, mode="complete")
+    t = q[:, -1]
+    if previous is None:
+        return t if t[-1] > 0 else -t
+    return t if t @ previous >= 0 else -t
+
+
+class QREPath:
+    """Traced branch of the logit QRE correspondence for one game."""
+
+    def __init__(self, p1_matrix, p2_matrix, tol=1e-10):
+        self.A = np.asarray(p1_matrix, dtype=float)
+        self.B = np.asarray(p2_matrix, dtype=float)
+        if self.A.shape != self.B.shape:
+            raise ValueError("Both payoff matrices must have the same shape.")
+        n, m = self.A.shape
+        self.tol = tol
+
+        start = np.concatenate([np.full(n, -np.log(n)), np.full(m, -np.log(m)), [0.0]])
+        self.points = [start]
+        self.tangent = _tangent(_jacobian(self.A, self.B, start[:-1], 0.0))
+        self.step = 0.1
+        self._lock = threading.RLock()
+
+    @property
+    def lambdas(self):
+        return self.curve()[0]
+
+    @property
+    def max_lambda(self):
+        return max(p[-1] for p in self.points)
+
+    def curve(self):
+        """``(lambdas, x, y)`` at every stored point, taken from one consistent snapshot of the path."""
+        with self._lock:
+            points = np.array(self.points)
+        n = self.A.shape[0]
+        return points[:, -1], np.exp(points[:, :n]), np.exp(points[:, n:-1])
+
+    def strategies(self):
+        """Player 1 and Player 2 probabilities at every stored point of the path."""
+        return self.curve()[1:]
+
+    def _correct(self, predicted, tangent, max_iter=8):
+        """Newton corrector on H = 0 plus the arclength constraint."""
+        v = predicted.copy()
+        with np.errstate(over="ignore", invalid="ignore"):
+            for _ in range(max_iter):
+                u, lam = v[:-1], v[-1]
+                F = np.concatenate([_residual(self.A, self.B, u, lam), [tangent @ (v - predicted)]])
+                if not np.all(np.isfinite(F)):
+                    return None
+                if np.max(np.abs(F)) < self.tol:
+                    return v
+                J = np.vstack([_jacobian(self.A, self.B, u, lam), tangent])
+                try:
+                    v = v - np.linalg.solve(J, F)
+                except np.linalg.LinAlgError:
+                    return None
+        return None
+
+    def extend(self, target_lambda, max_step=5.0, max_points=20000):
+        """Continue the path until it reaches ``target_lambda``."""
+        with self._lock:
+            self._extend(target_lambda, max_step, max_points)
+        return self
+
+    def _extend(self, target_lambda, max_step, max_points):
+        while self.points[-1][-1] < target_lambda and len(self.points) < max_points:
+            current = self.points[-1]
+            predicted = current + self.step * self.tangent
+            corrected = self._correct(predicted, self.tangent)
+            # A large correction means the step may have jumped to another branch
+            if corrected is None or np.linalg.norm(corrected - predicted) > 0.5 * self.step:
+                self.step /= 2
+                if self.step < 1e-8:
+                    raise RuntimeError("QRE continuation failed to converge.")
+                continue
+
+            u, lam = corrected[:-1], corrected[-1]
+            self.tangent = _tangent(_jacobian(self.A, self.B, u, lam), self.tangent)
+            self.points.append(corrected)
+            self.step = min(self.step * 1.5, max_step)
+
+    def at(self, lam):
+        """QRE strategies (x, y) at ``lam``, interpolated from the stored path."""
+        self.extend(lam)
+
+        # First crossing of lam along the branch, in case the path bends back
+        with self._lock:
+            points = list(self.points)
+        k = int(np.argmax(np.array([p[-1] for p in points]) >= lam))
+        if k == 0:
+            u = points[0][:-1].copy()
+        else:
+            lo, hi = points[k - 1], points[k]
+            w = (lam - lo[-1]) / (hi[-1] - lo[-1])
+            u = (1 - w) * lo[:-1] + w * hi[:-1]
+
+        # Newton polish at fixed lambda
+        n = self.A.shape[0]
+        for _ in range(5):
+            H = _residual(self.A, self.B, u, lam)
+            if np.max(np.abs(H)) < self.tol:
+                break
+            try:
+                u = u - np.linalg.solve(_jacobian(self.A, self.B, u, lam)[:, :-1], H)
+            except np.linalg.LinAlgError:
+                break
+        x, y = _split(u, n)
+        return x / x.sum(), y / y.sum()
+
+
+def qre_path(p1_matrix, p2_matrix):
+    """Cached QRE path of a game, created on first use."""
+    return _paths.get_or_create(array_key(p1_matrix, p2_matrix), lambda: QREPath(p1_matrix, p2_matrix))
+
+
+def logit_qre(p1_matrix, p2_matrix, lam):
+    """Logit QRE mixed strategies ``(x, y)`` at rationality ``lam``."""
+    return qre_path(p1_matrix, p2_matrix).at(lam)
@@ -0,0 +1,194 @@
+"""Precomputed expected-payoff and best-response surfaces for bimatrix games.
+
+For an N x M game every mixed strategy on a regular grid over each player's
+probability simplex is paired with every grid strategy of the opponent, and
+both players' expected payoffs are computed for all pairs at once with
+``einsum``. The best-response correspondence is the set of grid strategies
+that attain the highest payoff against each opponent strategy.
+
+Surfaces are computed once per game and cached, so looking up the payoffs
+of a strategy pair is an index into stored arrays. They are computed in
+blocks of Player 1's grid and stored as float32, so memory stays close to
+the stored surfaces; a 2x2 game at the default resolution needs about
+100 kB. Larger games grow with the square of the grid size: ``MAX_CELLS``
+grid pairs at most, which at the default resolution of 100 means 2xK games
+up to K = 4. ``payoff_surfaces`` lowers the resolution of larger games to
+fit.
+"""
+
+import itertools
+import math
+
+import numpy as np
+
+from caching import LRUCache, array_key
+
+
+# Number of games whose surfaces are kept in memory
+SURFACE_CACHE_SIZE = 16
+
+# Largest number of (Player 1, Player 2) grid pairs per surface
+MAX_CELLS = 1 << 24
+
+# Grid pairs per block of the float64 payoff computation
+_BLOCK_CELLS = 1 << 20
+
+_surfaces = LRUCache(SURFACE_CACHE_SIZE)
+
+
+def simplex_grid(n, resolution):
+    """All probability vectors over ``n`` strategies whose entries are multiples of 1 / resolution.
+
+    Returns an integer array of counts with shape (points, n); each row sums
+    to ``resolution``. For two strategies the rows are ordered by increasing
+    probability of the first strategy.
+    """
+    # Stars and bars: choose the positions of n - 1 bars among resolution + n - 1 slots
+    bars = np.array(list(itertools.combinations(range(resolution + n - 1), n - 1)), dtype=np.int64)
+    bars = bars.reshape(-1, n - 1)
+    edges = np.hstack([np.full((len(bars), 1), -1), bars, np.full((len(bars), 1), resolution + n - 1)])
+    return np.diff(edges, axis=1) - 1
+
+
+def grid_size(n, resolution):
+    """Number of points of ``simplex_grid(n, resolution)``."""
+    return math.comb(resolution + n - 1, n - 1)
+
+
+def max_resolution(n, m, resolution=100):
+    """Largest resolution up to ``resolution`` whose N x M surfaces fit in ``MAX_CELLS``."""
+    while resolution > 1 and grid_size(n, resolution) * grid_size(m, resolution) > MAX_CELLS:
+        resolution -= 1
+    return resolution
+
+
+class PayoffSurfaces:
+    """Expected payoffs and best responses of both players over the full strategy grid.
+
+    Attributes, with Player 1's grid strategies on the first axis of the
+    two-player arrays:
+
+    - ``x_grid``, ``y_grid``: grid strategies of Player 1 and Player 2
+    - ``pure_payoffs_1`` (y points, N): payoff of each of Player 1's pure
+      strategies against every grid strategy of Player 2, and
+      ``pure_payoffs_2`` (x points, M) the same for Player 2
+    - ``payoffs_1``, ``payoffs_2`` (x points, y points): expected payoffs
+    - ``best_response_1``, ``best_response_2`` (x points, y points): True
+      where the grid strategy is a best response to the opponent's
+    """
+
+    def __init__(self, p1_matrix, p2_matrix, resolution=100):
+        A = np.asarray(p1_matrix, dtype=float)
+        B = np.asarray(p2_matrix, dtype=float)
+        if A.shape != B.shape:
+            raise ValueError("Both payoff matrices must have the same shape.")
+        n, m = A.shape
+        if grid_size(n, resolution) * grid_size(m, resolution) > MAX_CELLS:
+            raise ValueError(f"A {n}x{m} game at resolution {resolution} is too large; lower the resolution.")
+        self.resolution = resolution
+
+        x_counts = simplex_grid(n, resolution)
+        y_counts = simplex_grid(m, resolution)
+        x = x_counts / resolution
+        y = y_counts / resolution
+        self._x_keys, self._x_order = self._keys(x_counts)
+        self._y_keys, self._y_order = self._keys(y_counts)
+
+        pure_1 = np.einsum("ij,qj->qi", A, y)
+        pure_2 = np.einsum("ij,pi->pj", B, x)
+
+        # A payoff that is linear over the simplex is largest at a pure strategy, and
+        # every pure strategy is a grid point, so the best payoffs are the pure maxima
+        best_1 = pure_1.max(axis=1)
+        best_2 = pure_2.max(axis=1)
+
+        # Best responses are decided in float64 so exact indifference is kept, one
+        # block of Player 1's grid at a time to keep float64 surfaces out of memory
+        tol = 1e-9 * max(np.abs(A).max(), np.abs(B).max(), 1.0)
+        n_x, n_y = len(x), len(y)
+        self.payoffs_1 = np.empty((n_x, n_y), dtype=np.float32)
+        self.payoffs_2 = np.empty((n_x, n_y), dtype=np.float32)
+        self.best_response_1 = np.empty((n_x, n_y), dtype=bool)
+        self.best_response_2 = np.empty((n_x, n_y), dtype=bool)
+        block = max(_BLOCK_CELLS // n_y, 1)
+        for start in range(0, n_x, block):
+            rows = slice(start, start + block)
+            payoffs_1 = np.einsum("pi,qi->pq", x[rows], pure_1)
+            payoffs_2 = np.einsum("qj,pj->pq", y, pure_2[rows])
+            self.best_response_1[rows] = payoffs_1 >= best_1 - tol
+            self.best_response_2[rows] = payoffs_2 >= best_2[rows, None] - tol
+            self.payoffs_1[rows] = payoffs_1
+            self.payoffs_2[rows] = payoffs_2
+
+        self.x_grid = x.astype(np.float32)
+        self.y_grid = y.astype(np.float32)
+        self.pure_payoffs_1 = pure_1.astype(np.float32)
+        self.pure_payoffs_2 = pure_2.astype(np.float32)
+
+    def _keys(self, counts):
+        """Sorted base-(resolution + 1) keys of grid points, for lookup by searchsorted."""
+        keys = counts @ (self.resolution + 1) ** np.arange(counts.shape[1])
+        order = np.argsort(keys)
+        return keys[order], order
+
+    def _index(self, strategy, keys, order):
+        strategy = np.asarray(strategy, dtype=float)
+        if abs(strategy.sum() - 1) > 1e-6:
+            raise ValueError("Strategy probabilities must sum to 1.")
+        # Round down, then give the remaining counts to the largest remainders
+        scaled = strategy * self.resolution
+        counts = np.floor(scaled + 1e-9).astype(np.int64)
+        remainders = scaled - counts
+        counts[np.argsort(-remainders)[:self.resolution - counts.sum()]] += 1
+        key = counts @ (self.resolution + 1) ** np.arange(counts.size)
+        return int(order[np.searchsorted(keys, key)])
+
+    def index(self, x, y):
+        """Grid indices of the strategies nearest to ``x`` and ``y``."""
+        return self._index(x, self._x_keys, self._x_order), self._index(y, self._y_keys, self._y_order)
+
+    def expected_payoffs(self, x, y):
+        """Expected payoffs of both players when they play ``x`` and ``y``."""
+        p, q = self.index(x, y)
+        return float(self.payoffs_1[p, q]), float(self.payoffs_2[p, q])
+
+    def pure_payoffs(self, x, y):
+        """Payoffs of Player 1's pure strategies against ``y`` and of Player 2's against ``x``."""
+        p, q = self.index(x, y)
+        return self.pure_payoffs_1[q], self.pure_payoffs_2[p]
+
+    def best_response_path(self, player):
+        """Best-response correspondence of a player in a 2x2 game as a line for plotting.
+
+        Returns ``(p2_probs, p1_probs)``: the probabilities of Strategy A of
+        Player 2 and Player 1 along the correspondence, ordered so that its
+        jump at the indifference point is drawn as a connected segment.
+        """
+        mask = self.best_response_1 if player == 1 else self.best_response_2.T
+        own, opponent = np.nonzero(mask)
+        own_probs = (self.x_grid if player == 1 else self.y_grid)[own, 0]
+        opponent_probs = (self.y_grid if player == 1 else self.x_grid)[opponent, 0]
+        # Walk along the opponent's axis, and along the own axis in the direction the response moves
+        rising = own_probs[opponent == opponent.max()].mean() >= own_probs[opponent == opponent.min()].mean()
+        order = np.lexsort((own_probs if rising else -own_probs, opponent))
+        if player == 1:
+            return opponent_probs[order], own_probs[order]
+        return own_probs[order], opponent_probs[order]
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.x_grid, self.y_grid, self.pure_payoffs_1, self.pure_payoffs_2,
+                                      self.payoffs_1, self.payoffs_2, self.best_response_1, self.best_response_2))
+
+
+def payoff_surfaces(p1_matrix, p2_matrix, resolution=100):
+    """Cached surfaces of a game, computed on first use.
+
+    The resolution is lowered, if needed, until the surfaces fit in
+    ``MAX_CELLS``; the one used is the ``resolution`` attribute.
+    """
+    A = np.asarray(p1_matrix, dtype=float)
+    B = np.asarray(p2_matrix, dtype=float)
+    resolution = max_resolution(*A.shape, resolution)
+    key = array_key(A, B, extra=resolution)
+    return _surfaces.get_or_create(key, lambda: PayoffSurfaces(A, B, resolution))
@@ -0,0 +1,82 @@
+"""Binary format of the equilibrium atlas and its fallback to live analysis."""
+
+import struct
+
+import numpy as np
+import pytest
+
+import atlas
+
+
+@pytest.fixture
+def atlas_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(atlas, "ATLAS_DIR", tmp_path)
+    monkeypatch.setattr(atlas, "_loaded", {})
+    return tmp_path
+
+
+@pytest.mark.parametrize("kind, low, high", [("symmetric", -3, 3), ("bimatrix", -1, 1)])
+def test_records_match_live_classification(atlas_dir, kind, low, high):
+    book = atlas.EquilibriumAtlas(atlas.build_atlas(kind, low, high))
+    indices = np.arange(len(book.records))
+    A, B = atlas._games_for_indices(kind, low, high, indices)
+    live = atlas.classify(A.astype(float), B.astype(float), atlas._LIVE_DTYPE)
+
+    np.testing.assert_array_equal(book.records["flags"], live["flags"])
+    mixed = (live["flags"] & atlas.MIXED_NE) != 0
+    for name in ["p_num", "p_den", "q_num", "q_den"]:
+        np.testing.assert_array_equal(book.records[name][mixed], live[name][mixed])
+
+    # Lookups find the record of the game they are given
+    for index in np.random.default_rng(0).choice(indices, 50):
+        assert book.index(A[index], B[index]) == index
+        assert atlas.decode(book.lookup(A[index], B[index])) == atlas.decode(live[index])
+
+
+def test_analyze_uses_the_atlas_inside_its_grid(atlas_dir):
+    atlas.build_atlas("symmetric", 0, 3)
+    game = np.array([[3, 0], [2, 1]])
+    summary, source = atlas.analyze(game, game.T, "symmetric", 0, 3)
+    assert source == "atlas"
+    assert summary == atlas.analyze(game, game.T, "symmetric", 0, 4)[0]
+    assert atlas.analyze(game + 5, game.T + 5, "symmetric", 0, 3)[1] == "live"
+
+
+def corrupt_checksum(path):
+    with open(path, "r+b") as f:
+        f.seek(atlas._HEADER.size)
+        byte = f.read(1)
+        f.seek(atlas._HEADER.size)
+        f.write(bytes([byte[0] ^ 1]))
+
+
+def set_version(path, version):
+    with open(path, "r+b") as f:
+        f.seek(len(atlas._MAGIC))
+        f.write(struct.pack("<H", version))
+
+
+@pytest.mark.parametrize("damage, message", [(corrupt_checksum, "checksum"),
+                                             (lambda path: set_version(path, atlas.ATLAS_VERSION - 1), "version")])
+def test_damaged_or_outdated_files_fall_back_to_live(atlas_dir, damage, message):
+    damage(atlas.build_atlas("symmetric", 0, 3))
+    with pytest.raises(ValueError, match=message):
+        atlas.EquilibriumAtlas(atlas.atlas_path("symmetric", 0, 3))
+
+    game = np.array([[3, 0], [5, 1]])
+    summary, source = atlas.analyze(game, game.T, "symmetric", 0, 3)
+    assert source == "live"
+    assert summary["p1_dominance"] == "Strategy B strictly dominant"
+
+
+def test_weak_dominance_names_the_strategy():
+    A = np.array([[[1, 0], [1, -1]], [[1, -1], [1, 0]]])
+    records = atlas.classify(A, A.transpose(0, 2, 1), atlas._LIVE_DTYPE)
+    assert [atlas.decode(r)["p1_dominance"] for r in records] == ["Strategy A weakly dominant",
+                                                                   "Strategy B weakly dominant"]
+
+
+@pytest.mark.parametrize("low, high", [(-200, -190), (120, 140)])
+def test_payoffs_must_fit_in_int8(atlas_dir, low, high):
+    with pytest.raises(ValueError, match="int8"):
+        atlas.build_atlas("symmetric", low, high)
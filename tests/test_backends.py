@@ -0,0 +1,63 @@
+"""Every backend of every kernel must agree with the NumPy reference."""
+
+import numpy as np
+import pytest
+
+import backends
+
+
+CASES = [(name, backend) for name in backends._KERNELS for backend in backends.available_backends(name)]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def four_workers():
+    """Run the multiprocess backend on several workers even on a single-CPU machine."""
+    workers, pool = backends._workers, backends._pool
+    backends._workers, backends._pool = (lambda: 4), None
+    yield
+    if backends._pool is not None:
+        backends._pool.shutdown()
+    backends._workers, backends._pool = workers, pool
+    backends._calibration.clear()
+
+
+@pytest.mark.parametrize("name, backend", CASES)
+@pytest.mark.parametrize("size", [1, 7_001, 50_000])
+def test_backend_matches_numpy(name, backend, size):
+    args = backends._KERNELS[name]["sample"](size)
+    expected = backends.run(name, *args, backend="numpy")
+    result = backends.run(name, *args, backend=backend)
+    assert backends._same_result(result, expected)
+
+
+@pytest.mark.parametrize("name", list(backends._KERNELS))
+def test_calibration_keeps_every_backend(name):
+    assert set(backends.calibrate(name)) == set(backends.available_backends(name))
+
+
+def test_small_calls_run_on_numpy_without_calibration():
+    backends._calibration.clear()
+    game = np.zeros((1, 2, 2))
+    assert backends.select_backend("pure_nash", game, game) == "numpy"
+    assert "pure_nash" not in backends._calibration
+
+
+def test_background_calibration_covers_every_kernel(monkeypatch):
+    backends._calibration.clear()
+    monkeypatch.setattr(backends, "_calibration_thread", None)
+    thread = backends.calibrate_in_background()
+    assert backends.calibrate_in_background() is thread
+    thread.join(timeout=300)
+    assert set(backends._calibration) == set(backends._KERNELS)
+
+
+def test_large_calls_run_on_numpy_while_calibrating(monkeypatch):
+    class Running:
+        def is_alive(self):
+            return True
+
+    backends._calibration.clear()
+    monkeypatch.setattr(backends, "_calibration_thread", Running())
+    args = backends._KERNELS["pure_nash"]["sample"](50_000)
+    assert backends.select_backend("pure_nash", *args) == "numpy"
+    assert "pure_nash" not in backends._calibration
@@ -0,0 +1,48 @@
+"""The restricted correlated-equilibrium search must match the full LP."""
+
+import numpy as np
+import pytest
+from scipy.optimize import linprog
+
+from correlated import OBJECTIVES, correlated_equilibrium, incentive_constraints, incentive_gains
+
+
+def full_lp_value(A, B, W):
+    G = incentive_constraints(A, B)
+    result = linprog(-W.ravel(), A_ub=G, b_ub=np.zeros(G.shape[0]), A_eq=np.ones((1, W.size)), b_eq=[1],
+                     bounds=(0, None), method="highs")
+    return -result.fun
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("options", [{}, {"full_fraction": 2.0}, {"cells_per_round": 1}])
+def test_matches_full_lp(seed, options):
+    rng = np.random.default_rng(seed)
+    n, m = rng.integers(2, 12, 2)
+    A = rng.integers(-5, 6, (n, m)).astype(float)
+    # Every other game is close to zero-sum, where most strategy pairs are needed
+    B = -A + rng.integers(-1, 2, (n, m)) if seed % 2 else rng.integers(-5, 6, (n, m)).astype(float)
+    for objective, W in zip(OBJECTIVES + [rng.normal(size=(n, m))], [A + B, A, B, None]):
+        W = objective if W is None else W
+        P, _ = correlated_equilibrium(A, B, objective, **options)
+        gains_1, gains_2 = incentive_gains(A, B, P)
+        assert P.sum() == pytest.approx(1.0)
+        assert min(gains_1.min(), gains_2.min()) > -1e-6
+        assert (P * W).sum() == pytest.approx(full_lp_value(A, B, W), abs=1e-6)
+
+
+def test_zero_sum_games_use_minimax_strategies():
+    A = np.array([[0.0, -1, 1], [1, 0, -1], [-1, 1, 0]])
+    P, info = correlated_equilibrium(A, -A)
+    np.testing.assert_allclose(P, np.full((3, 3), 1 / 9), atol=1e-9)
+    assert info["rounds"] == 0
+
+
+def test_limits_are_reported():
+    rng = np.random.default_rng(0)
+    A = rng.normal(size=(60, 60))
+    B = -A + 0.1 * rng.normal(size=(60, 60))
+    with pytest.raises(RuntimeError, match="constraint entries"):
+        correlated_equilibrium(A, B, max_nonzeros=10_000)
+    with pytest.raises(RuntimeError, match="time limit"):
+        correlated_equilibrium(A, B, time_limit=0.5)
@@ -0,0 +1,195 @@
+"""Scheduling, deduplication, cancellation and input-file handling of the job scheduler."""
+
+import time
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+
+import backends
+import jobs
+
+
+class ManualPool:
+    """Stands in for the worker pool; the test decides when each job finishes."""
+
+    def __init__(self):
+        self.started = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.started.append((args, future))
+        return future
+
+    def finish(self, index, result=None, error=None):
+        future = self.started[index][1]
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    monkeypatch.setattr(jobs.JobScheduler, "_start_pool", lambda self: setattr(self, "_pool", ManualPool()))
+    return jobs.JobScheduler(max_workers=1, per_user_limit=1)
+
+
+def params(n):
+    return {"payoff_matrix": [[3, 0], [5, 1]], "initial_freq_a": 0.5, "num_generations": n,
+            "selection_strength": 1.0}
+
+
+def started_generations(scheduler):
+    return [args[1]["num_generations"] for args, _ in scheduler._pool.started]
+
+
+def upload(tmp_path, name):
+    path = tmp_path / name
+    path.write_text("0 1\n1 2\n")
+    return {"edge_path": str(path)}
+
+
+def test_identical_jobs_are_shared_across_users(scheduler):
+    first = scheduler.submit("alice", "replicator", params(10))
+    assert scheduler.submit("bob", "replicator", params(10)) == first
+    assert scheduler.get(first).users == {"alice", "bob"}
+    assert len(scheduler._pool.started) == 1
+
+    scheduler._pool.finish(0, "result")
+    assert scheduler.submit("carol", "replicator", params(10)) == first
+    assert scheduler.get(first).result == "result"
+
+
+def test_failed_jobs_are_not_reused(scheduler):
+    first = scheduler.submit("alice", "replicator", params(10))
+    scheduler._pool.finish(0, error=ValueError("boom"))
+    assert scheduler.get(first).status == jobs.FAILED
+    assert scheduler.submit("alice", "replicator", params(10)) != first
+
+
+def test_cancel_detaches_until_the_last_user_cancels(scheduler):
+    job_id = scheduler.submit("alice", "replicator", params(10))
+    scheduler.submit("bob", "replicator", params(10))
+    slot = scheduler.get(job_id).slot
+
+    assert scheduler.cancel(job_id, "alice") is False
+    assert scheduler._cancel[slot] == 0
+    assert scheduler.cancel(job_id, "bob") is True
+    assert scheduler._cancel[slot] == 1
+
+    scheduler._pool.finish(0, error=jobs.JobCancelled())
+    assert scheduler.get(job_id).status == jobs.CANCELLED
+
+
+def test_cancelling_a_queued_job_drops_it(scheduler):
+    scheduler.submit("alice", "replicator", params(10))
+    queued = scheduler.submit("alice", "replicator", params(20))
+    assert scheduler.cancel(queued, "alice") is True
+    assert scheduler.get(queued).status == jobs.CANCELLED
+
+    scheduler._pool.finish(0)
+    assert started_generations(scheduler) == [10]
+
+
+def test_queued_jobs_are_dispatched_round_robin(scheduler):
+    for n in (10, 11, 12):
+        scheduler.submit("alice", "replicator", params(n))
+    for n in (20, 21):
+        scheduler.submit("bob", "replicator", params(n))
+
+    for index in range(5):
+        scheduler._pool.finish(index)
+    assert started_generations(scheduler) == [10, 20, 11, 21, 12]
+
+
+def test_queue_limit_per_user(scheduler):
+    scheduler.max_queued_per_user = 1
+    scheduler.submit("alice", "replicator", params(10))
+    scheduler.submit("alice", "replicator", params(11))
+    with pytest.raises(jobs.QueueFull):
+        scheduler.submit("alice", "replicator", params(12))
+    scheduler.submit("bob", "replicator", params(12))
+
+
+def test_each_job_keeps_its_own_upload(scheduler, tmp_path):
+    network = {"network_type": "Edge-list file", "upload": "same-file", "update_rule": "Fermi"}
+    fermi = upload(tmp_path, "a.txt")
+    death_birth = upload(tmp_path, "b.txt")
+    scheduler.submit("alice", "network", network, fermi)
+    scheduler.submit("alice", "network", {**network, "update_rule": "Death-birth"}, death_birth)
+
+    # The job receives its file as a parameter, but the file is not part of its identity
+    assert scheduler._pool.started[0][0][1]["edge_path"] == fermi["edge_path"]
+    assert "edge_path" not in scheduler.get(1).params
+
+    scheduler._pool.finish(0)
+    assert not (tmp_path / "a.txt").exists()
+    assert (tmp_path / "b.txt").exists()
+    scheduler._pool.finish(1)
+    assert not (tmp_path / "b.txt").exists()
+
+
+def test_unused_uploads_are_deleted(scheduler, tmp_path):
+    network = {"network_type": "Edge-list file", "upload": "same-file"}
+    scheduler.submit("alice", "network", network, upload(tmp_path, "a.txt"))
+    scheduler.submit("bob", "network", network, upload(tmp_path, "b.txt"))
+    assert (tmp_path / "a.txt").exists()
+    assert not (tmp_path / "b.txt").exists()
+
+    scheduler.max_queued_per_user = 0
+    with pytest.raises(jobs.QueueFull):
+        scheduler.submit("alice", "network", {**network, "upload": "other"}, upload(tmp_path, "c.txt"))
+    assert not (tmp_path / "c.txt").exists()
+
+
+def test_cancelled_jobs_delete_their_upload(scheduler, tmp_path):
+    network = {"network_type": "Edge-list file", "upload": "same-file"}
+    scheduler.submit("alice", "replicator", params(10))
+    queued = scheduler.submit("alice", "network", network, upload(tmp_path, "a.txt"))
+    scheduler.cancel(queued, "alice")
+    assert not (tmp_path / "a.txt").exists()
+
+
+class RecordingContext:
+    def __init__(self, cancel_at=None):
+        self.reports = []
+        self.cancel_at = cancel_at
+
+    def report(self, fraction):
+        self.reports.append(fraction)
+        if self.cancel_at is not None and fraction >= self.cancel_at:
+            raise jobs.JobCancelled()
+
+
+def test_replicator_job_reports_progress_and_matches_a_single_run():
+    context = RecordingContext()
+    result = jobs._replicator_job(params(500), context)
+    expected = backends.run("replicator", np.array([[3, 0], [5, 1]]), np.array([0.5]), 500, 1.0, backend="numpy")
+    for key, value in zip(["freq_a", "fitness_a", "fitness_b", "avg_fitness"], expected):
+        np.testing.assert_allclose(result[key], value[0])
+    assert len(context.reports) > 10
+    assert context.reports == sorted(context.reports)
+
+
+def test_replicator_job_stops_when_cancelled():
+    with pytest.raises(jobs.JobCancelled):
+        jobs._replicator_job(params(500), RecordingContext(cancel_at=0.5))
+
+
+def test_network_jobs_run_in_worker_processes(tmp_path):
+    scheduler = jobs.JobScheduler(max_workers=2, per_user_limit=2)
+    try:
+        network = {"network_type": "Edge-list file", "upload": "same-file", "payoff_matrix": [[3, 0], [5, 1]],
+                   "initial_freq_a": 0.5, "num_steps": 20, "selection_strength": 1.0}
+        ids = [scheduler.submit("alice", "network", {**network, "update_rule": rule},
+                                upload(tmp_path, f"{rule}.txt"))
+               for rule in ("Fermi", "Death-birth")]
+        deadline = time.time() + 120
+        while not all(scheduler.get(i).finished for i in ids) and time.time() < deadline:
+            time.sleep(0.1)
+        assert [scheduler.get(i).status for i in ids] == [jobs.DONE, jobs.DONE], [scheduler.get(i).error for i in ids]
+        assert scheduler.get(ids[0]).result["n_nodes"] == 3
+        assert list(tmp_path.iterdir()) == []
+    finally:
+        scheduler._pool.shutdown()
@@ -0,0 +1,21 @@
+"""Update rules on sparse interaction networks."""
+
+import numpy as np
+
+from networks import Graph, _death_birth
+
+
+class ZeroRandom:
+    def random(self, size):
+        return np.zeros(size)
+
+
+def test_death_birth_only_copies_own_neighbours():
+    # Node 0 has one neighbour (node 2); node 1 has neighbours 3 and 4. With node 3's weight
+    # exp(-5), the cumulative sum before node 1's edges rounds to just below node 0's total.
+    graph = Graph.from_edges(np.array([0, 1, 1]), np.array([2, 3, 4]), 5)
+    payoffs = np.array([0.0, 0.0, 0.0, -5.0, 0.0])
+    strategy = np.array([1, 1, 1, 0, 0], dtype=np.int8)
+
+    new = _death_birth(graph, strategy, payoffs, ZeroRandom(), 1.0)
+    assert new[1] == 0
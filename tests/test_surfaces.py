@@ -0,0 +1,42 @@
+"""Expected-payoff and best-response surfaces."""
+
+import numpy as np
+import pytest
+
+import surfaces
+from surfaces import MAX_CELLS, PayoffSurfaces, grid_size, payoff_surfaces, simplex_grid
+
+
+def test_blocks_match_direct_computation(monkeypatch):
+    rng = np.random.default_rng(0)
+    A = rng.integers(-3, 4, (3, 2)).astype(float)
+    B = rng.integers(-3, 4, (3, 2)).astype(float)
+    monkeypatch.setattr(surfaces, "_BLOCK_CELLS", 50)
+    s = PayoffSurfaces(A, B, resolution=12)
+
+    x, y = simplex_grid(3, 12) / 12, simplex_grid(2, 12) / 12
+    payoffs_1 = x @ A @ y.T
+    payoffs_2 = x @ B @ y.T
+    np.testing.assert_allclose(s.payoffs_1, payoffs_1, rtol=1e-6, atol=1e-6)
+    np.testing.assert_allclose(s.payoffs_2, payoffs_2, rtol=1e-6, atol=1e-6)
+    np.testing.assert_array_equal(s.best_response_1, payoffs_1 >= payoffs_1.max(axis=0) - 1e-9)
+    np.testing.assert_array_equal(s.best_response_2, payoffs_2 >= payoffs_2.max(axis=1, keepdims=True) - 1e-9)
+
+
+def test_large_games_get_a_coarser_grid():
+    A = np.arange(9.0).reshape(3, 3)
+    with pytest.raises(ValueError):
+        PayoffSurfaces(A, A.T)
+    s = payoff_surfaces(A, A.T)
+    assert s.resolution < 100
+    assert grid_size(3, s.resolution) ** 2 <= MAX_CELLS
+    x, y = np.array([0.01, 0.01, 0.98]), np.full(3, 1 / 3)
+    assert s.expected_payoffs(x, y) == pytest.approx((x @ A @ y, x @ A.T @ y), abs=0.1)
+
+
+def test_lookup_rounds_to_the_nearest_grid_point():
+    A = np.array([[3.0, 0], [5, 1]])
+    s = payoff_surfaces(A, A.T)
+    assert s.expected_payoffs([0.504, 0.496], [1, 0]) == pytest.approx((4.0, 1.5))
+    with pytest.raises(ValueError):
+        s.expected_payoffs([0.6, 0.6], [1, 0])
@@ -14,9 +14,17 @@
 
 import inspect
 import textwrap
+import time
+import uuid
 
 import streamlit as st
 
+import backends
+from jobs import CANCELLED, DONE, FAILED, QUEUED, get_scheduler, job_key
+
+# Every page imports this module, so the server calibrates the compute backends once at start
+backends.calibrate_in_background()
+
 
 def show_code(demo):
     """Showing the code of the demo."""
@@ -26,3 +34,49 @@ def show_code(demo):
         st.markdown("## Code")
         sourcelines, _ = inspect.getsourcelines(demo)
         st.code(textwrap.dedent("".join(sourcelines[1:])))
+
+
+def session_user():
+    """Identifier of the current browser session, used for per-user job limits."""
+    return st.session_state.setdefault("user_id", uuid.uuid4().hex)
+
+
+def submit_job(state_key, kind, params, files=None):
+    """Submit a background job and remember it in the session under ``state_key``."""
+    st.session_state[state_key] = get_scheduler().submit(session_user(), kind, params, files)
+
+
+def follow_job(state_key, kind, params):
+    """Show the progress of the session's job and return its result once finished.
+
+    Returns None while the job is queued or running, if it failed or was
+    cancelled, or if the remembered job was run with different parameters.
+    """
+    scheduler = get_scheduler()
+    job_id = st.session_state.get(state_key)
+    job = scheduler.get(job_id) if job_id is not None else None
+    if job is None or job.key != job_key(kind, params):
+        return None
+
+    if job.status == DONE:
+        return job.result
+    if job.status == FAILED:
+        st.error(f"Simulation failed: {job.error}")
+        return None
+    if job.status == CANCELLED:
+        st.warning("Simulation cancelled.")
+        return None
+
+    if job.status == QUEUED:
+        st.progress(0.0, text="Waiting for a free worker...")
+    else:
+        st.progress(scheduler.progress(job_id), text="Running simulation in the background...")
+    if st.button("Cancel", key=f"{state_key}_cancel"):
+        if not scheduler.cancel(job_id, session_user()):
+            # Other sessions still wait for this job; only stop following it here
+            del st.session_state[state_key]
+        st.rerun()
+
+    # Poll again shortly; the job keeps running if the user leaves the page
+    time.sleep(0.5)
+    st.rerun()